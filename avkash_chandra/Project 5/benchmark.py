@@ -0,0 +1,247 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+import dash
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+SEASONS = 20
+LOAD_SEASONS = [20, 1000]   # one table the size of the dashboard's, one of decades of player-seasons
+PLAYERS_PER_SEASON = 550   # everyone who appeared in a season, two-way and 10-day contracts included
+
+teams = ['ATL','BOS','BRK','CHI','CHO','CLE','DAL','DEN','DET','GSW','HOU','IND','LAC','LAL','MEM',
+         'MIA','MIL','MIN','NOP','NYK','OKC','ORL','PHI','PHO','POR','SAC','SAS','TOR','UTA','WAS']
+positions = ['PG','SG','SF','PF','C']
+stat_cols = ['FG','FGA','FG%','3P','3PA','3P%','2P','2PA','2P%','eFG%','FT','FTA','FT%',
+             'ORB','DRB','TRB','AST','STL','BLK','TOV','PF']
+
+
+# ---------- Synthetic player table ----------
+def synthetic_players(seasons=SEASONS, per_season=PLAYERS_PER_SEASON, seed=0):
+    # same columns and formats as nba_salaries.csv, one row per player-season
+    rng = np.random.default_rng(seed)
+    rows = seasons * per_season
+    traded = rng.random(rows) < 0.08
+    team = rng.choice(teams, rows)
+    team = np.where(traded, np.char.add(np.char.add(team, '/'), rng.choice(teams, rows)), team)
+    dual = rng.random(rows) < 0.05
+    position = rng.choice(positions, rows)
+    position = np.where(dual, np.char.add(np.char.add(position, '-'), rng.choice(positions, rows)), position)
+    mp = np.round(rng.uniform(2, 38, rows), 1)
+    pts = np.round(mp * rng.uniform(0.2, 0.8, rows), 1)
+    salary = np.round(np.exp(rng.normal(15, 1.1, rows)) * (0.5 + mp / 38))
+
+    frame = pd.DataFrame({
+        'Player Name': [f'Player {i}' for i in range(rows)],
+        'Salary': salary.astype(np.int64),
+        'Position': position,
+        'Age': rng.integers(19, 42, rows),
+        'Team': team,
+        'GP': rng.integers(1, 83, rows),
+        'GS': rng.integers(0, 83, rows),
+        'MP': mp,
+    })
+    for c in stat_cols:
+        frame[c] = np.round(rng.uniform(0, 10, rows), 3)
+    frame['PTS'] = pts
+    frame['Player-additional'] = [f'player{i:05d}' for i in range(rows)]
+    return frame
+
+
+def write_players(frame):
+    # the dashboard reads nba_salaries.csv from the working directory
+    workdir = tempfile.mkdtemp()
+    frame.to_csv(os.path.join(workdir, 'nba_salaries.csv'))
+    return workdir
+
+
+def load_dashboard(workdir=HERE):
+    # the Colab export starts with a "!pip install" line, which plain Python can't parse
+    os.chdir(workdir)
+    path = os.path.join(HERE, 'project5.py')
+    source = '\n'.join('# ' + line if line.startswith('!') else line for line in open(path).read().splitlines())
+    module = types.ModuleType('project5')
+    module.__file__ = path
+    exec(compile(source, path, 'exec'), module.__dict__)
+    return module
+
+
+def recorded_trace(dashboard, seed=1):
+    # a session's worth of filter moves: slider drags, plus the odd team/position pick
+    rng = np.random.default_rng(seed)
+    df = dashboard.df
+    all_teams, all_pos = sorted(df['Team'].dropna().unique()), sorted(df['Position'].dropna().unique())
+    age_lo, age_hi = int(df['Age'].min()), int(df['Age'].max())
+    team, pos, age, min_gp, min_mp = None, None, [age_lo, age_hi], 0, 0
+    trace = []
+    for _ in range(200):
+        move = rng.choice(['age', 'gp', 'mp', 'team', 'pos'], p=[0.3, 0.3, 0.25, 0.1, 0.05])
+        if move == 'age':
+            low = int(rng.integers(age_lo, age_hi))
+            age = [low, int(rng.integers(low, age_hi + 1))]
+        elif move == 'gp':
+            min_gp = int(rng.choice(range(0, 81, 20)))
+        elif move == 'mp':
+            min_mp = int(rng.choice(range(0, 41, 10)))
+        elif move == 'team':
+            team = list(rng.choice(all_teams, int(rng.integers(0, 4)), replace=False)) or None
+        else:
+            pos = list(rng.choice(all_pos, int(rng.integers(0, 3)), replace=False)) or None
+        trace.append((team, pos, list(age), min_gp, min_mp))
+    return trace
+
+
+def copy_and_mask(df, team, pos, age, min_gp, min_mp):
+    # the previous apply_filters: copy the frame, then chain boolean masks
+    out = df.copy()
+    if team:
+        out = out[out['Team'].isin(team)]
+    if pos:
+        out = out[out['Position'].isin(pos)]
+    if age:
+        out = out[(out['Age'] >= age[0]) & (out['Age'] <= age[1])]
+    out = out[(out['GP'] >= min_gp) & (out['MP'] >= min_mp)]
+    return out
+
+
+def latencies_ms(fn, trace):
+    out = []
+    for args in trace:
+        start = time.perf_counter()
+        fn(*args)
+        out.append((time.perf_counter() - start) * 1000)
+    return np.array(out)
+
+
+# ---------- Benchmarks ----------
+def bench_filter_latency():
+    dashboard = load_dashboard(write_players(synthetic_players()))
+    df = dashboard.df
+    trace = recorded_trace(dashboard)
+
+    for args in trace[:20]:
+        assert len(copy_and_mask(df, *args)) == len(dashboard.apply_filters(*args))
+
+    print(f"Filtering {len(df):,} player-seasons ({SEASONS} seasons), {len(trace)} recorded filter moves")
+    paths = [
+        ('df.copy() + masks', lambda *args: copy_and_mask(df, *args)),
+        ('filter engine rows', dashboard.apply_filters),
+        ('engine + view copy', lambda *args: df[dashboard.view_cols].take(dashboard.apply_filters(*args))),
+    ]
+    for label, fn in paths:
+        ms = latencies_ms(fn, trace)
+        print(f"  {label:20s} p50 {np.percentile(ms, 50):8.3f} ms   p95 {np.percentile(ms, 95):8.3f} ms")
+
+
+def legacy_load(path):
+    # the previous load & clean: regex on every salary, to_numeric on every column, row by row tiers
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    if 'Unnamed: 0' in df.columns:
+        df = df.drop(columns=['Unnamed: 0'])
+    df['Salary'] = df['Salary'].astype(str).str.replace(r'[\$,]', '', regex=True).astype(float)
+    for c in ['Age','GP','GS','MP','PTS'] + stat_cols:
+        df[c] = pd.to_numeric(df[c], errors='coerce')
+    df['Team'] = df['Team'].str.split('/').str[0]
+    df['Position'] = df['Position'].str.split('-').str[0]
+    df['Salary_Tier'] = df['Salary'].apply(
+        lambda s: 'Low' if s < 1000000 else 'Medium' if s < 5000000 else 'High' if s < 10000000 else 'Very High')
+    df['MPG_Bin'] = pd.cut(df['MP'], bins=[0,10,20,30,40,50,60],
+                           labels=['0-10','10-20','20-30','30-40','40-50','50-60'])
+    df['GP_Bin'] = pd.cut(df['GP'], bins=[0,20,40,60,80,100],
+                          labels=['0-20','20-40','40-60','60-80','80-100'])
+    return df
+
+
+def elapsed_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_load():
+    print("Loading nba_salaries.csv")
+    for seasons in LOAD_SEASONS:
+        workdir = write_players(synthetic_players(seasons=seasons))
+        dashboard = load_dashboard(workdir)
+        path = os.path.join(workdir, 'nba_salaries.csv')
+
+        legacy_ms = elapsed_ms(lambda: legacy_load(path))
+        shutil.rmtree(dashboard.CACHE_DIR)
+        cold_ms = elapsed_ms(lambda: dashboard.load_players(path))
+        warm_ms = elapsed_ms(lambda: dashboard.load_players(path))
+        print(f"  {seasons * PLAYERS_PER_SEASON:>9,} rows  previous clean {legacy_ms:8.0f} ms   "
+              f"vectorized + cache write {cold_ms:8.0f} ms   warm (hash + Parquet) {warm_ms:8.0f} ms")
+
+
+def replay(dashboard, trace):
+    # replay the trace like one browser session: figure-hashes comes back in on every call
+    sent, skipped = {}, np.zeros(5, dtype=int)
+    start = time.perf_counter()
+    for args in trace:
+        *figures, sent = dashboard.update(*args, sent)
+        skipped += [figure is dash.no_update for figure in figures]
+    return skipped, (time.perf_counter() - start) * 1000
+
+
+def bench_unchanged_figures():
+    tables = [('nba_salaries.csv', HERE), (f'synthetic, {SEASONS} seasons', write_players(synthetic_players()))]
+    for label, workdir in tables:
+        dashboard = load_dashboard(workdir)
+        trace = recorded_trace(dashboard)
+        skipped, fingerprinted_ms = replay(dashboard, trace)
+        start = time.perf_counter()
+        for args in trace:
+            dashboard.update(*args, {})
+        rebuild_ms = (time.perf_counter() - start) * 1000
+
+        print(f"Recorded trace of {len(trace)} filter moves on {label}")
+        print("  figures not re-sent: " + ", ".join(f"plot{i} {count}" for i, count in enumerate(skipped, start=1)))
+        print(f"  total: {skipped.sum()} of {5 * len(trace)} figure serializations saved")
+        print(f"  callback time for the trace: {rebuild_ms:8.0f} ms rebuilding everything, {fingerprinted_ms:8.0f} ms with fingerprints")
+
+
+def bench_pts_tiers():
+    seasons = LOAD_SEASONS[-1]
+    dashboard = load_dashboard(write_players(synthetic_players(seasons=seasons)))
+    df = dashboard.df
+    some_teams = sorted(df['Team'].unique())[:6]
+    selections = [
+        ('all players', None, None, None),
+        ('6 teams', some_teams, None, None),
+        ('centers', None, ['C'], None),
+        ('6 teams, MP >= 30', some_teams, None, 30),
+    ]
+
+    print(f"PTS quartile cuts on {len(df):,} player-seasons (sketch error {dashboard.PTS_SKETCH_ERROR:.0%})")
+    for label, team, pos, min_mp in selections:
+        rows = dashboard.apply_filters(team, pos, None, 0, min_mp or 0)
+        pts = df['PTS'].to_numpy()[rows]
+        dashboard.merged_sketches.clear()
+
+        qcut_ms = elapsed_ms(lambda: pd.qcut(pd.Series(pts), q=4, labels=dashboard.pts_labels))
+        first_ms = elapsed_ms(lambda: dashboard.pts_cut_points(pts, team, pos))
+        cached_ms = elapsed_ms(lambda: dashboard.pts_cut_points(pts, team, pos))
+        cuts = dashboard.pts_cut_points(pts, team, pos)
+        ordered = np.sort(pts)
+        # distance from each target rank to the rank range the cut value covers (PTS has many ties)
+        low = np.searchsorted(ordered, cuts, side='left') / len(ordered)
+        high = np.searchsorted(ordered, cuts, side='right') / len(ordered)
+        targets = np.array([0.25, 0.5, 0.75])
+        rank_error = np.maximum(np.maximum(low - targets, targets - high), 0).max()
+        print(f"  {label:18s} {len(rows):>8,} rows   pd.qcut {qcut_ms:7.1f} ms   "
+              f"cut points {first_ms:6.1f} ms (first), {cached_ms:6.2f} ms (again)   max rank error {rank_error:.4f}")
+
+
+if __name__ == '__main__':
+    bench_filter_latency()
+    bench_load()
+    bench_unchanged_figures()
+    bench_pts_tiers()
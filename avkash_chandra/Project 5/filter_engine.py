@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+
+# ---------- Filter engine ----------
+# Index built once over the player table:
+#   range columns    -> row positions sorted by value, so a [low, high] filter is a searchsorted span
+#   category columns -> sorted row positions per value
+# rows() starts from the smallest of those candidate sets and checks the other filters on just
+# those rows, returning sorted row positions into the original frame (no frame is copied)
+class FilterEngine:
+    def __init__(self, frame, range_columns, category_columns):
+        self.size = len(frame)
+        self.values = {}
+        self.order = {}
+        self.sorted_values = {}
+        for c in range_columns:
+            values = frame[c].to_numpy(dtype=float)
+            order = np.argsort(values, kind='stable')
+            order = order[~np.isnan(values[order])]   # missing values never pass a range filter
+            self.values[c] = values
+            self.order[c] = order
+            self.sorted_values[c] = values[order]
+
+        self.codes = {}
+        self.code_of = {}
+        self.members = {}
+        for c in category_columns:
+            codes, labels = pd.factorize(frame[c])
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            self.codes[c] = codes
+            self.code_of[c] = {label: i for i, label in enumerate(labels)}
+            self.members[c] = {label: order[bounds[i]:bounds[i + 1]] for i, label in enumerate(labels)}
+
+    def span(self, column, low=None, high=None):
+        # row positions with low <= value <= high (either end open when None)
+        sorted_values = self.sorted_values[column]
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side='left')
+        end = len(sorted_values) if high is None else np.searchsorted(sorted_values, high, side='right')
+        return self.order[column][start:end]
+
+    def rows(self, categories=None, ranges=None):
+        # categories: {column: list of values}, ranges: {column: (low, high)}; empty/None entries are ignored
+        categories = {c: v for c, v in (categories or {}).items() if v}
+        ranges = {c: r for c, r in (ranges or {}).items() if r is not None and any(b is not None for b in r)}
+
+        candidates = [(sum(len(self.members[c].get(v, ())) for v in values), 'category', c)
+                      for c, values in categories.items()]
+        candidates += [(len(self.span(c, *bounds)), 'range', c) for c, bounds in ranges.items()]
+        if not candidates:
+            return np.arange(self.size)
+
+        _, kind, column = min(candidates, key=lambda candidate: candidate[0])
+        if kind == 'category':
+            rows = np.concatenate([self.members[column].get(v, np.empty(0, dtype=np.intp))
+                                   for v in categories.pop(column)])
+        else:
+            rows = self.span(column, *ranges.pop(column))
+
+        for c, values in categories.items():
+            wanted = [self.code_of[c][v] for v in values if v in self.code_of[c]]
+            rows = rows[np.isin(self.codes[c][rows], wanted)]
+        for c, (low, high) in ranges.items():
+            values = self.values[c][rows]
+            keep = ~np.isnan(values)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            rows = rows[keep]
+        return np.sort(rows)
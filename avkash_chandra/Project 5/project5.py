@@ -9,51 +9,135 @@ Original file is located at
 
 !pip install dash plotly kaleido
 
+import hashlib
+import inspect
+import os
+import tempfile
+
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from filter_engine import FilterEngine
+from quantile_sketch import QuantileSketch
 
 # ---------- Load & clean ----------
-df = pd.read_csv("nba_salaries.csv")
-df.columns = df.columns.str.strip()
-if 'Unnamed: 0' in df.columns:
-    df = df.drop(columns=['Unnamed: 0'])
-
-# Clean Salary
-df['Salary'] = df['Salary'].astype(str).str.replace(r'[\$,]', '', regex=True).astype(float)
+# cleaned/derived table is cached as Parquet under a hash of the CSV's bytes and of the
+# derivation code below, so a warm start skips parsing and cleaning and just reads the columns back
+CACHE_DIR = '.nba_cache'
 
-# Numeric columns
 num_cols = ['Age','GP','GS','MP','FG','FGA','FG%','3P','3PA','3P%','2P','2PA','2P%',
             'eFG%','FT','FTA','FT%','ORB','DRB','TRB','AST','STL','BLK','TOV','PF','PTS']
-for c in num_cols:
-    if c in df.columns:
-        df[c] = pd.to_numeric(df[c], errors='coerce')
-
-# Normalize Teams and Positions
-df['Team'] = df['Team'].str.split('/').str[0]
-df['Position'] = df['Position'].str.split('-').str[0]
-
-# ---------- Define Salary Tier ----------
-def salary_tier(s):
-    if s < 1000000:
-        return 'Low'
-    elif s < 5000000:
-        return 'Medium'
-    elif s < 10000000:
-        return 'High'
-    else:
-        return 'Very High'
-
-df['Salary_Tier'] = df['Salary'].apply(salary_tier)
-
-# ---------- Define MPG/GP bins ----------
-df['MPG_Bin'] = pd.cut(df['MP'], bins=[0,10,20,30,40,50,60],
-                       labels=['0-10','10-20','20-30','30-40','40-50','50-60'])
-df['GP_Bin'] = pd.cut(df['GP'], bins=[0,20,40,60,80,100],
-                      labels=['0-20','20-40','40-60','60-80','80-100'])
+tier_labels = ['Low','Medium','High','Very High']
+mpg_labels = ['0-10','10-20','20-30','30-40','40-50','50-60']
+
+def first_part(col, sep):
+    # split the few distinct strings, not every row
+    codes, uniques = pd.factorize(col)
+    firsts = pd.Series(uniques).str.split(sep).str[0].to_numpy()
+    return pd.Series(np.where(codes >= 0, firsts[codes], None), index=col.index, dtype=col.dtype)
+
+def derive_columns(df):
+    df.columns = df.columns.str.strip()
+    if 'Unnamed: 0' in df.columns:
+        df = df.drop(columns=['Unnamed: 0'])
+
+    # Clean Salary (only text columns need the $ and , stripped)
+    if not pd.api.types.is_numeric_dtype(df['Salary']):
+        df['Salary'] = df['Salary'].astype(str).str.replace(r'[\$,]', '', regex=True)
+    df['Salary'] = df['Salary'].astype(float)
+
+    # Numeric columns (read_csv already parsed most of them)
+    for c in num_cols:
+        if c in df.columns and not pd.api.types.is_numeric_dtype(df[c]):
+            df[c] = pd.to_numeric(df[c], errors='coerce')
+
+    # Normalize Teams and Positions
+    df['Team'] = first_part(df['Team'], '/')
+    df['Position'] = first_part(df['Position'], '-')
+
+    # ---------- Define Salary Tier ----------
+    # <1M Low, <5M Medium, <10M High, everything else (missing salary too) Very High
+    s = df['Salary'].to_numpy()
+    df['Salary_Tier'] = np.select([s < 1000000, s < 5000000, s < 10000000], tier_labels[:3], default=tier_labels[3])
+
+    # ---------- Define MPG/GP bins ----------
+    df['MPG_Bin'] = pd.cut(df['MP'], bins=[0,10,20,30,40,50,60], labels=mpg_labels)
+    df['GP_Bin'] = pd.cut(df['GP'], bins=[0,20,40,60,80,100],
+                          labels=['0-20','20-40','40-60','60-80','80-100'])
+    return df
+
+def derivation_source():
+    # changes whenever the cleaning code or its labels do, so an old cache is never served after an edit
+    code = ''.join(inspect.getsource(f) for f in (first_part, derive_columns))
+    return (code + repr((num_cols, tier_labels, mpg_labels))).encode()
+
+def load_players(path):
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read() + derivation_source()).hexdigest()[:16]
+    cache = os.path.join(CACHE_DIR, f'{digest}.parquet')
+    if os.path.exists(cache):
+        return pd.read_parquet(cache)
+
+    df = derive_columns(pd.read_csv(path))
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # write to a temp file of our own then rename, so a half-written file is never read;
+    # older versions of the CSV are dropped (other workers' in-flight .tmp files are left alone)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        df.to_parquet(f, index=False)
+    os.replace(tmp_path, cache)
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith('.parquet') and name != os.path.basename(cache):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except FileNotFoundError:  # another worker got there first
+                pass
+    return df
+
+df = load_players("nba_salaries.csv")
+
+# ---------- Filter index ----------
+engine = FilterEngine(df, range_columns=['Age','GP','MP'], category_columns=['Team','Position'])
+
+# columns the five figures read; each callback copies just these, for just the matching rows
+view_cols = ['Player Name','Team','Position','Salary','Salary_Tier','PTS','MP','GP','MPG_Bin']
+
+# ---------- PTS tiers ----------
+# one PTS quantile sketch per (Team, Position); when the filters keep whole partitions (no range
+# filter cuts any of their rows) the quartile cuts come from merging those sketches instead of
+# sorting the selected rows. Small selections and range-cut ones get exact quartiles.
+PTS_SKETCH_ERROR = 0.01    # normalized rank error allowed in sketched cut points
+EXACT_TIER_ROWS = 20000    # selections up to this size always get exact quartiles
+pts_labels = ['Low','Medium','High','Very High']
+
+pts_sketches = {key: QuantileSketch(PTS_SKETCH_ERROR).update(pts)
+                for key, pts in df.groupby(['Team','Position'], dropna=False)['PTS']}
+merged_sketches = {}
+
+def pts_cut_points(pts, team, pos):
+    pts = pts[~np.isnan(pts)]
+    if len(pts) == 0:
+        return np.full(3, np.nan)
+    if len(pts) > EXACT_TIER_ROWS:
+        key = (tuple(sorted(team)) if team else None, tuple(sorted(pos)) if pos else None)
+        if key not in merged_sketches:
+            merged = QuantileSketch(PTS_SKETCH_ERROR)
+            for (t, p), sketch in pts_sketches.items():
+                if (not team or t in team) and (not pos or p in pos):
+                    merged.merge(sketch)
+            merged_sketches[key] = merged
+        if merged_sketches[key].n == len(pts):   # the selection is exactly these partitions
+            return merged_sketches[key].quantiles([0.25, 0.5, 0.75])
+    return np.quantile(pts, [0.25, 0.5, 0.75])
+
+def pts_tiers(pts, cuts):
+    # same bins as pd.qcut(q=4): (-inf, q1], (q1, q2], (q2, q3], (q3, inf); repeated cut points just leave a tier empty
+    codes = np.searchsorted(cuts, pts, side='left')
+    codes[np.isnan(pts)] = -1
+    return pd.Categorical.from_codes(codes, categories=pts_labels, ordered=True)
 
 # ---------- App ----------
 app = dash.Dash(__name__)
@@ -119,6 +203,8 @@ app.layout = html.Div([
             dcc.Graph(id='plot3', style={'width':'100%','height':'400px','marginBottom':'20px'}),
             dcc.Graph(id='plot4', style={'width':'100%','height':'400px','marginBottom':'20px'}),
             dcc.Graph(id='plot5', style={'width':'100%','height':'400px','marginBottom':'20px'}),
+            # fingerprints of the data behind the figures this browser already has
+            dcc.Store(id='figure-hashes', data={}),
         ], style={'width':'82%','padding':'10px','backgroundColor':'white'}),
 
     ], style={'display':'flex','width':'90%','margin':'0 auto','backgroundColor':'white'}),
@@ -126,16 +212,23 @@ app.layout = html.Div([
 ], style={'backgroundColor':'white','minHeight':'100vh'})
 
 # ---------- Filter function ----------
-def apply_filters(df, team, pos, age, min_gp, min_mp):
-    out = df.copy()
-    if team:
-        out = out[out['Team'].isin(team)]
-    if pos:
-        out = out[out['Position'].isin(pos)]
-    if age:
-        out = out[(out['Age'] >= age[0]) & (out['Age'] <= age[1])]
-    out = out[(out['GP'] >= min_gp) & (out['MP'] >= min_mp)]
-    return out
+# row positions in df matching every filter
+def apply_filters(team, pos, age, min_gp, min_mp):
+    return engine.rows(
+        categories={'Team': team, 'Position': pos},
+        ranges={'Age': age, 'GP': (min_gp, None), 'MP': (min_mp, None)}
+    )
+
+# ---------- Fingerprints ----------
+# hash of the data a figure is drawn from; if the browser already has a figure built from
+# the same data, the callback sends dash.no_update instead of building and serializing it again
+def fingerprint(*parts):
+    h = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            part = pd.util.hash_pandas_object(part, index=False).to_numpy()
+        h.update(np.ascontiguousarray(part).tobytes())
+    return h.hexdigest()
 
 # ---------- Callback ----------
 @app.callback(
@@ -144,53 +237,70 @@ def apply_filters(df, team, pos, age, min_gp, min_mp):
     Output('plot3','figure'),
     Output('plot4','figure'),
     Output('plot5','figure'),
+    Output('figure-hashes','data'),
     Input('team','value'),
     Input('pos','value'),
     Input('age','value'),
     Input('min_gp','value'),
     Input('min_mp','value'),
+    State('figure-hashes','data'),
 )
-def update(team,pos,age,min_gp,min_mp):
-    d = apply_filters(df,team,pos,age,min_gp,min_mp)
+def update(team,pos,age,min_gp,min_mp,sent=None):
+    rows = apply_filters(team,pos,age,min_gp,min_mp)
+    d = df[view_cols].take(rows)
+
+    sent = sent or {}
+    hashes = {}
+    def changed(plot, key):
+        hashes[plot] = key
+        return sent.get(plot) != key
+
+    fig1 = fig2 = fig3 = fig4 = fig5 = dash.no_update
 
     # ---------- Plot 1 ----------
     avg_salary = d.groupby("Position")["Salary"].mean().reset_index()
     avg_salary = avg_salary.sort_values("Salary", ascending=False)
-    fig1 = px.bar(
-        avg_salary, x='Position', y='Salary', text='Salary',
-        title="Relationship Between Salary and Position<br><sup>Average pay differs sharply across positions</sup>"
-    )
-    fig1.update_traces(texttemplate='%{text:,.0f}', textposition='outside', showlegend=False)
-    if not avg_salary.empty:
-        ymax = float(avg_salary['Salary'].max())
-        fig1.update_yaxes(range=[0, ymax*1.15])   # add headroom
-    fig1.update_layout(margin=dict(t=110), template='plotly_white')
+    if changed('plot1', fingerprint(avg_salary)):
+        fig1 = px.bar(
+            avg_salary, x='Position', y='Salary', text='Salary',
+            title="Relationship Between Salary and Position<br><sup>Average pay differs sharply across positions</sup>"
+        )
+        fig1.update_traces(texttemplate='%{text:,.0f}', textposition='outside', showlegend=False)
+        if not avg_salary.empty:
+            ymax = float(avg_salary['Salary'].max())
+            fig1.update_yaxes(range=[0, ymax*1.15])   # add headroom
+        fig1.update_layout(margin=dict(t=110), template='plotly_white')
 
     # ---------- Plot 2 ----------
     agg2 = d.groupby(['Position','Salary_Tier']).agg({'PTS':'mean'}).reset_index()
-    fig2 = px.bar(
-        agg2, x='Position', y='PTS', color='Salary_Tier', barmode='group',
-        title="Relationship Between Points and Position with Salary Tier<br><sup>Compare pay tiers within positions</sup>"
-    )
-    fig2.update_layout(template='plotly_white')
+    if changed('plot2', fingerprint(agg2)):
+        fig2 = px.bar(
+            agg2, x='Position', y='PTS', color='Salary_Tier', barmode='group',
+            title="Relationship Between Points and Position with Salary Tier<br><sup>Compare pay tiers within positions</sup>"
+        )
+        fig2.update_layout(template='plotly_white')
 
     # ---------- Plot 3 ----------
-    fig3 = px.scatter(
-        d, x='PTS', y='Salary', color='Position',
-        hover_data=['Player Name','Team','MP','GP'],
-        title="Salary vs Points<br><sup>Outlier individual points shows that scoring doesn’t always match pay</sup>"
-    )
-    fig3.update_layout(template='plotly_white')
+    # every matching player is a point, so the rows themselves are the data
+    if changed('plot3', fingerprint(rows)):
+        fig3 = px.scatter(
+            d, x='PTS', y='Salary', color='Position',
+            hover_data=['Player Name','Team','MP','GP'],
+            title="Salary vs Points<br><sup>Outlier individual points shows that scoring doesn’t always match pay</sup>"
+        )
+        fig3.update_layout(template='plotly_white')
 
     # ---------- Plot 4 ----------
     if not d.empty:
-        d['PTS_Tier'] = pd.qcut(d['PTS'], q=4, labels=['Low','Medium','High','Very High'])
-    fig4 = px.scatter(
-        d, x='MP', y='Salary', color='PTS_Tier' if not d.empty else None,
-        hover_data=['Player Name','Team','Position','MP','PTS'],
-        title="Salary vs Minutes Per Game<br><sup>Effect of playing time on pay</sup>"
-    )
-    fig4.update_layout(template='plotly_white')
+        pts = d['PTS'].to_numpy()
+        d['PTS_Tier'] = pts_tiers(pts, pts_cut_points(pts, team, pos))
+    if changed('plot4', fingerprint(rows, d['PTS_Tier'] if not d.empty else rows)):
+        fig4 = px.scatter(
+            d, x='MP', y='Salary', color='PTS_Tier' if not d.empty else None,
+            hover_data=['Player Name','Team','Position','MP','PTS'],
+            title="Salary vs Minutes Per Game<br><sup>Effect of playing time on pay</sup>"
+        )
+        fig4.update_layout(template='plotly_white')
 
     # ---------- Plot 5 ----------
     agg5 = d.dropna(subset=['MPG_Bin']).groupby(['Position','MPG_Bin']).agg({'Salary':'mean'}).reset_index()
@@ -198,13 +308,14 @@ def update(team,pos,age,min_gp,min_mp):
         bins_present = sorted(agg5['MPG_Bin'].unique(),
                               key=lambda x: ['0-10','10-20','20-30','30-40','40-50','50-60'].index(x))
         agg5['MPG_Bin'] = pd.Categorical(agg5['MPG_Bin'], categories=bins_present, ordered=True)
-    fig5 = px.bar(
-        agg5, x='Position', y='Salary', color='MPG_Bin', barmode='group',
-        title="Impact of Playing Time by Position For Salary<br><sup>Playing time raises pay, but effect varies by position</sup>"
-    )
-    fig5.update_layout(template='plotly_white')
+    if changed('plot5', fingerprint(agg5)):
+        fig5 = px.bar(
+            agg5, x='Position', y='Salary', color='MPG_Bin', barmode='group',
+            title="Impact of Playing Time by Position For Salary<br><sup>Playing time raises pay, but effect varies by position</sup>"
+        )
+        fig5.update_layout(template='plotly_white')
 
-    return fig1, fig2, fig3, fig4, fig5
+    return fig1, fig2, fig3, fig4, fig5, hashes
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
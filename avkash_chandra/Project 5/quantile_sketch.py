@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+
+
+# ---------- Quantile sketch ----------
+# KLL-style mergeable sketch: items sit in levels, an item on level h stands for 2**h values.
+# A full level is sorted and every other item (random start) moves up one level, so memory stays
+# around 3k items however many values are added. Two sketches merge by joining their levels.
+# Normalized rank error is about 3.3 / k (k=200 -> ~1.65%), so k is picked from the error wanted.
+def k_for_error(error):
+    return max(8, math.ceil(3.3 / error))
+
+
+class QuantileSketch:
+    def __init__(self, error=0.01, seed=0):
+        self.k = k_for_error(error)
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        # lower levels get geometrically smaller buffers, the top level gets k
+        return max(2, int(self.k * (2 / 3) ** (len(self.levels) - 1 - level)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        self.n += other.n
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        # value at each requested rank, from the items weighted by their level
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=float) * cumulative[-1]
+        return values[order][np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(values) - 1)]
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity(level):
+                items = np.sort(items)
+                keep = items[:len(items) % 2]           # an odd one out stays on this level
+                pairs = items[len(items) % 2:]
+                promoted = pairs[self.rng.integers(2)::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
@@ -0,0 +1,107 @@
+"""
+timings for the dashboard's trend lines (run from this folder)
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import trendline
+
+FIT_ROWS = [3_000, 1_000_000]
+REPEATS = 20
+BOX_ROWS = [3_000, 300_000, 3_000_000, 30_000_000]
+RAW_BOX_LIMIT = 3_000_000  # px.box serializes every row, so the raw comparison stops here
+
+
+# import time in a fresh interpreter, so nothing is cached from earlier imports
+def import_ms(statement):
+    code = f"import sys, time; sys.path.insert(0, {HERE!r}); start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    return float(subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True).stdout) * 1000
+
+
+def bench_imports():
+    print("import time (fresh process)")
+    print(f"  statsmodels.api (what trendline='ols' pulls in): {import_ms('import statsmodels.api'):8.0f} ms")
+    print(f"  trendline:                                       {import_ms('import trendline'):8.0f} ms")
+    print(f"  whole dashboard (project5):                      {import_ms('import project5'):8.0f} ms")
+    loaded = subprocess.run([sys.executable, "-c", "import sys; sys.path.insert(0, '.'); import project5; print('statsmodels' in sys.modules)"],
+                            cwd=HERE, capture_output=True, text=True, check=True).stdout.strip()
+    print(f"  statsmodels loaded by the dashboard: {loaded}")
+
+
+def per_call_ms(fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def bench_fits():
+    import statsmodels.api as sm
+
+    rng = np.random.default_rng(0)
+    for rows in FIT_ROWS:
+        x = rng.uniform(1, 10, rows)
+        frame = pd.DataFrame({"x": x, "y": 8 - 0.2 * x + rng.normal(0, 1, rows)})
+        stats = trendline.sufficient_stats(frame["x"], frame["y"])
+
+        timings = [
+            ("statsmodels OLS fit", lambda: sm.OLS(frame["y"], sm.add_constant(frame["x"])).fit()),
+            ("sums + closed form", lambda: trendline.fit_line(trendline.sufficient_stats(frame["x"], frame["y"]))),
+            ("cached sums", lambda: trendline.fit_line(stats)),
+            ("px.scatter trendline='ols'", lambda: px.scatter(frame, x="x", y="y", trendline="ols")),
+            ("px.scatter + add_trendline", lambda: trendline.add_trendline(px.scatter(frame, x="x", y="y"), stats, "x", "y")),
+        ]
+        print(f"fit latency, {rows:,} rows")
+        for label, fn in timings:
+            print(f"  {label:28s} {per_call_ms(fn):9.3f} ms")
+
+
+# survey-like rows: addiction level 1-10, apps used 5-20 rising with addiction
+def synthetic_survey(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    level = rng.integers(1, 11, rows)
+    apps = np.clip(np.round(rng.normal(5 + level, 4)), 5, 20).astype(int)
+    return pd.DataFrame({"Addiction_Level_Round": level, "Apps_Used_Daily": apps})
+
+
+def build_ms_kb(build):
+    # server side render: build the figure and serialize what gets sent to the browser
+    start = time.perf_counter()
+    payload = build().to_json()
+    return (time.perf_counter() - start) * 1000, len(payload) / 1024
+
+
+def bench_box():
+    os.chdir(HERE)
+    import project5
+
+    x, y = "Addiction_Level_Round", "Apps_Used_Daily"
+    labels = ("Addiction Level (rounded)", "Number of Apps Used Daily")
+    print("addiction level box plot: build + serialize, payload")
+    for rows in BOX_ROWS:
+        frame = synthetic_survey(rows)
+        start = time.perf_counter()
+        summaries = project5.box_summaries(frame, x, y)
+        summary_ms = (time.perf_counter() - start) * 1000
+        ms, kb = build_ms_kb(lambda: project5.box_figure(summaries, x, labels, "box"))
+        line = f"  {rows:>11,} rows  summaries {summary_ms:8.0f} ms (once)  figure {ms:6.1f} ms {kb:8.1f} KB"
+        if rows <= RAW_BOX_LIMIT:
+            raw_ms, raw_kb = build_ms_kb(lambda: px.box(frame, x=x, y=y))
+            line += f"   | px.box {raw_ms:8.0f} ms {raw_kb:10.1f} KB"
+        print(line)
+
+
+if __name__ == "__main__":
+    bench_imports()
+    bench_fits()
+    bench_box()
@@ -3,12 +3,14 @@ tested in google colab, had to install dash
 """
 
 # imports
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 from plotly.graph_objects import Figure
 from dash import Dash, dcc, html, Input, Output
+from trendline import sufficient_stats, add_trendline
 
 # dataframe from csv
 df = pd.read_csv("teen_phone_addiction_dataset.csv")
@@ -22,8 +24,26 @@ Story: Students are becoming addiction to their phones
 # plot 1: stacked bar (time on social, time on education, time on games BY age groups)
 # get the 3 columns
 activity_columns = ['Time_on_Social_Media', 'Time_on_Gaming', 'Time_on_Education']
+
+# activity sums and counts for every age x gender x grade cell (missing keys kept as their own cell), scanned once at startup
+# means for any grouping key (and any subset of its values) are rebuilt from these rows, not from df
+store_keys = ['Age', 'Gender', 'School_Grade']
+activity_sums = df.groupby(store_keys, dropna=False)[activity_columns].sum()
+activity_counts = df.groupby(store_keys, dropna=False)[activity_columns].count()
+activity_rollups = {}
+
+def activity_means(key, values=None):
+    # sums and counts add up, so rolling the cells up to one key is exact
+    if key not in activity_rollups:
+        activity_rollups[key] = (activity_sums.groupby(level=key).sum(), activity_counts.groupby(level=key).sum())
+    sums, counts = activity_rollups[key]
+    if values is not None:
+        keep = sums.index.isin(values)
+        sums, counts = sums[keep], counts[keep]
+    return (sums / counts).reset_index()
+
 # group by age
-df_age_activities = df.groupby('Age')[activity_columns].mean().reset_index()
+df_age_activities = activity_means('Age')
 
 # df_age_activities.head()
 
@@ -56,20 +76,29 @@ fig1.update_layout(
 )
 # fig1.show()
 
+# regression sums per (x, y) pair, computed once and reused by every trend line drawn for that pair
+trend_stats = {}
+
+def trendline_stats(x, y):
+    if (x, y) not in trend_stats:
+        trend_stats[(x, y)] = sufficient_stats(df[x], df[y])
+    return trend_stats[(x, y)]
+
 # plot 2: scatter plot (more addicted = checking phone more) with linear regression line (to show trend)
 fig2 = px.scatter(
     data_frame=df,
     x="Phone_Checks_Per_Day",
     y="Addiction_Level",
     opacity=0.4,
-    trendline="ols",  # regression line
-    trendline_color_override="red", # make it red
     labels={
         "Phone_Checks_Per_Day": "Number of Phone Checks Per Day",
         "Addiction_Level": "Addiction Level (scale 1-10)"
     },
     title="Addiction Level Increases with Phone Checks"
 )
+# red regression line with its 95% confidence band
+add_trendline(fig2, trendline_stats("Phone_Checks_Per_Day", "Addiction_Level"), "Phone_Checks_Per_Day", "Addiction_Level",
+              x_label="Number of Phone Checks Per Day", y_label="Addiction Level (scale 1-10)")
 
 # fig2.show()
 
@@ -79,28 +108,60 @@ fig3 = px.scatter(
     x="Addiction_Level",
     y="Sleep_Hours",
     opacity=0.4,
-    trendline="ols",  # trendline
-    trendline_color_override="red", # make it red
     labels={
         "Addiction_Level": "Addiction Level",
         "Sleep_Hours": "Average Sleep Time (hours)"
     },
     title="Higher Addiction Leads to Less Sleep"
 )
+# red regression line with its 95% confidence band
+add_trendline(fig3, trendline_stats("Addiction_Level", "Sleep_Hours"), "Addiction_Level", "Sleep_Hours",
+              x_label="Addiction Level", y_label="Average Sleep Time (hours)")
 
 # fig3.show()
 
 # plot 4: box plot (addiction level vs education time)
 # make it rounded so no decimals
 df['Addiction_Level_Round'] = df['Addiction_Level'].round().astype(int)
-fig4 = px.box(
-    data_frame=df,
-    x='Addiction_Level_Round',
-    y='Apps_Used_Daily',
-    labels={
-        'Addiction_Level_Round': 'Addiction Level (rounded)',
-        'Apps_Used_Daily': 'Number of Apps Used Daily'
-    },
+
+# the box stats are worked out here instead of in the browser, so only a handful of numbers per box
+# get sent no matter how many rows there are (same rules plotly uses: quartiles interpolated at
+# p * n - 0.5, whiskers at the furthest points within 1.5 IQR, everything past them is an outlier)
+MAX_OUTLIERS = 50  # outlier points drawn per box, evenly spread over the sorted outliers
+
+def box_summaries(frame, x, y):
+    rows = []
+    for group, values in frame.groupby(x)[y]:
+        values = values.dropna().to_numpy()
+        q1, median, q3 = np.percentile(values, [25, 50, 75], method='hazen')
+        low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        inside = values[(values >= low) & (values <= high)]
+        outliers = np.sort(values[(values < low) | (values > high)])
+        if len(outliers) > MAX_OUTLIERS:
+            outliers = outliers[np.linspace(0, len(outliers) - 1, MAX_OUTLIERS).round().astype(int)]
+        rows.append({x: group, 'q1': q1, 'median': median, 'q3': q3,
+                     'lowerfence': inside.min(), 'upperfence': inside.max(), 'outliers': outliers})
+    return pd.DataFrame(rows)
+
+def box_figure(summaries, x, labels, title):
+    fig = go.Figure(go.Box(
+        x=summaries[x], q1=summaries['q1'], median=summaries['median'], q3=summaries['q3'],
+        lowerfence=summaries['lowerfence'], upperfence=summaries['upperfence'],
+        marker_color='#636efa', name='', showlegend=False
+    ))
+    # outlier sample as plain markers on top of the boxes
+    fig.add_trace(go.Scatter(
+        x=np.repeat(summaries[x], summaries['outliers'].str.len()),
+        y=np.concatenate(list(summaries['outliers'])),
+        mode='markers', marker_color='#636efa', name='', showlegend=False
+    ))
+    fig.update_layout(title=title, xaxis_title=labels[0], yaxis_title=labels[1])
+    return fig
+
+fig4 = box_figure(
+    box_summaries(df, 'Addiction_Level_Round', 'Apps_Used_Daily'),
+    'Addiction_Level_Round',
+    labels=('Addiction Level (rounded)', 'Number of Apps Used Daily'),
     title='Addiction Increases the Apps Used Daily'
 )
 
@@ -112,14 +173,15 @@ fig5 = px.scatter(
     x="Addiction_Level",
     y="Daily_Usage_Hours",
     opacity=0.4,
-    trendline="ols",  # trendline
-    trendline_color_override="red",
     labels={
         "Addiction_Level": "Addiction Level (1-10)",
         "Daily_Usage_Hours": "Daily Phone Usage (hours)"
     },
     title="Higher Addiction Level Leads to More Daily Phone Usage"
 )
+# red regression line with its 95% confidence band
+add_trendline(fig5, trendline_stats("Addiction_Level", "Daily_Usage_Hours"), "Addiction_Level", "Daily_Usage_Hours",
+              x_label="Addiction Level (1-10)", y_label="Daily Phone Usage (hours)")
 
 # fig5.show()
 
@@ -189,11 +251,9 @@ if __name__ == '__main__':
 )
 # trigger function: get the ages that are selected in dropdown, and recreate figure based on that
 def update_graphs(selected_ages):
-    # filter df based on selected ages
-    filtered_df = df[df["Age"].isin(selected_ages)]
+    # per-age means for just the selected ages, from the stored sums and counts
+    df_age_activities = activity_means('Age', selected_ages)
     # recreate fig1 (just same code from aboce)
-    activity_columns = ['Time_on_Social_Media', 'Time_on_Gaming', 'Time_on_Education']
-    df_age_activities = filtered_df.groupby('Age')[activity_columns].mean().reset_index()
     fig1 = go.Figure()
     fig1.add_trace(go.Bar(x=df_age_activities['Age'], y=df_age_activities['Time_on_Social_Media'], name='Social Media'))
     fig1.add_trace(go.Bar(x=df_age_activities['Age'], y=df_age_activities['Time_on_Gaming'], name='Gaming'))
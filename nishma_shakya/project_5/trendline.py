@@ -0,0 +1,90 @@
+"""
+closed-form linear trend lines for the scatter plots
+(replaces plotly's trendline="ols", so statsmodels never gets imported)
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+# two-sided 95% quantile of the normal distribution
+Z_975 = 1.959963984540054
+
+
+# sums that describe a least-squares line: n, Σx, Σy, Σxy, Σx², Σy² (plus the x range to draw over)
+# works along the last axis, so a 2d array of series is fitted in one go
+# rows with a missing x or y are skipped, same as the ols trendline
+def sufficient_stats(x, y):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    return {
+        "n": valid.sum(axis=-1),
+        "x": x.sum(axis=-1),
+        "y": y.sum(axis=-1),
+        "xy": (x * y).sum(axis=-1),
+        "xx": (x * x).sum(axis=-1),
+        "yy": (y * y).sum(axis=-1),
+        "x_min": np.where(valid, x, np.inf).min(axis=-1),
+        "x_max": np.where(valid, x, -np.inf).max(axis=-1),
+    }
+
+
+# stats of separate chunks add up to the stats of all rows, so new rows never need a refit from scratch
+def merge_stats(*parts):
+    merged = {key: sum(part[key] for part in parts) for key in ("n", "x", "y", "xy", "xx", "yy")}
+    merged["x_min"] = np.minimum.reduce([part["x_min"] for part in parts])
+    merged["x_max"] = np.maximum.reduce([part["x_max"] for part in parts])
+    return merged
+
+
+# slope, intercept and R² straight from the sums
+def fit_line(stats):
+    n = stats["n"]
+    sxx = stats["xx"] - stats["x"] ** 2 / n
+    sxy = stats["xy"] - stats["x"] * stats["y"] / n
+    syy = stats["yy"] - stats["y"] ** 2 / n
+    slope = sxy / sxx
+    residual = np.maximum(syy - slope * sxy, 0.0)
+    return {
+        "n": n,
+        "slope": slope,
+        "intercept": (stats["y"] - slope * stats["x"]) / n,
+        "r2": 1 - residual / syy,
+        "x_mean": stats["x"] / n,
+        "sxx": sxx,
+        "std_err": np.sqrt(residual / (n - 2)),
+    }
+
+
+# 97.5% quantile of Student's t (Cornish-Fisher expansion, plenty accurate past a few dozen rows)
+def t_quantile(dof):
+    z = Z_975
+    return z + (z ** 3 + z) / (4 * dof) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2)
+
+
+# fitted line and its 95% confidence band for the mean at each x
+def confidence_band(fit, xs):
+    xs = np.asarray(xs, dtype=float)
+    line = fit["intercept"] + fit["slope"] * xs
+    half = t_quantile(fit["n"] - 2) * fit["std_err"] * np.sqrt(1 / fit["n"] + (xs - fit["x_mean"]) ** 2 / fit["sxx"])
+    return line, line - half, line + half
+
+
+# draw the band and the red line on top of a px.scatter, with the same hover text as px's ols trendline
+def add_trendline(fig, stats, x_name, y_name, x_label=None, y_label=None, color="red", points=50):
+    fit = fit_line(stats)
+    xs = np.linspace(stats["x_min"], stats["x_max"], points)
+    line, lower, upper = confidence_band(fit, xs)
+
+    fig.add_trace(go.Scatter(x=xs, y=lower, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+    fig.add_trace(go.Scatter(x=xs, y=upper, mode="lines", line=dict(width=0), fill="tonexty",
+                             fillcolor="rgba(255, 0, 0, 0.15)", showlegend=False, hoverinfo="skip"))
+    fig.add_trace(go.Scatter(
+        x=xs[[0, -1]], y=line[[0, -1]], mode="lines", line=dict(color=color), name="", showlegend=False,
+        hovertemplate=(f"<b>OLS trendline</b><br>{y_name} = {fit['slope']:g} * {x_name} + {fit['intercept']:g}"
+                       f"<br>R<sup>2</sup>={fit['r2']:f}<br><br>{x_label or x_name}=%{{x}}"
+                       f"<br>{y_label or y_name}=%{{y}} <b>(trend)</b><extra></extra>")
+    ))
+    return fig
@@ -0,0 +1,132 @@
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+SHOTS = 1_000_000
+# the commit that made loading and figure building lazy; the eager baseline is its parent
+LAZY_COMMIT_GREP = r"^\[user-012\] "
+
+results = ["Goal", "MissedShots", "SavedShot", "BlockedShot", "ShotOnPost"]
+situations = ["OpenPlay", "FromCorner", "SetPiece", "DirectFreekick", "Penalty"]
+shot_types = ["RightFoot", "LeftFoot", "Head", "OtherBodyPart"]
+last_actions = ["Pass", "Cross", "None", "Rebound", "TakeOn", "Aerial", "BallRecovery", "Chipped", "Throughball", "Standard"]
+
+
+def synthetic_shots(rows, seed=0):
+    # same columns the dashboard reads from the understat fullshotsdata.csv export
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "minute": rng.integers(0, 96, rows),
+        "result": rng.choice(results, rows, p=[0.11, 0.38, 0.26, 0.22, 0.03]),
+        "h_a": rng.choice(["h", "a"], rows),
+        "situation": rng.choice(situations, rows, p=[0.72, 0.16, 0.07, 0.04, 0.01]),
+        "shotType": rng.choice(shot_types, rows, p=[0.5, 0.3, 0.19, 0.01]),
+        "lastAction": rng.choice(last_actions, rows),
+        "season": rng.integers(2014, 2025, rows),
+    })
+
+
+def write_shots(rows):
+    # project5 reads fullshotsdata.csv from the working directory
+    workdir = tempfile.mkdtemp()
+    synthetic_shots(rows).to_csv(os.path.join(workdir, "fullshotsdata.csv"), index=False)
+    os.chdir(workdir)
+    return workdir
+
+
+def load_app(rows):
+    write_shots(rows)
+    sys.modules.pop("project5", None)
+    app = importlib.import_module("project5")
+    app.ensure_loaded()
+    return app
+
+
+def payload_kb(fig):
+    return len(fig.to_json()) / 1024
+
+
+def bench_goal_count_payload():
+    app = load_app(SHOTS)
+    goals_df = app.goals_df
+
+    start = time.perf_counter()
+    raw = [
+        px.bar(goals_df, x="situation", color="h_a"),
+        px.bar(goals_df[goals_df["lastAction"].isin(app.top_actions)], x="lastAction", color="lastAction"),
+        px.bar(goals_df, x="shotType", color="shotType"),
+    ]
+    raw_ms = (time.perf_counter() - start) * 1000
+
+    app.count_tables.clear()
+    start = time.perf_counter()
+    aggregated = [app.update_fig1(None), app.make_fig2(), app.make_fig3()]
+    aggregated_ms = (time.perf_counter() - start) * 1000
+
+    app.update_fig1("h")
+    start = time.perf_counter()
+    app.update_fig1("h")
+    cached_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Goal-count bar charts on {SHOTS:,} synthetic shots ({len(goals_df):,} goals)")
+    print(f"  raw goal rows:     {sum(map(payload_kb, raw)):10.1f} KB   build {raw_ms:8.1f} ms")
+    print(f"  count tables:      {sum(map(payload_kb, aggregated)):10.1f} KB   build {aggregated_ms:8.1f} ms")
+    print(f"  cached h_a filter: update_fig1 {cached_ms:8.1f} ms")
+
+
+def git(*args):
+    return subprocess.run(["git", *args], cwd=HERE, capture_output=True, check=True).stdout
+
+
+def eager_checkout():
+    # project5.py and shot_feed.py from before the lazy-loading commit, in a folder of their own;
+    # None when that revision can't be found (no git, not a checkout, history rewritten)
+    try:
+        commits = git("log", "--reverse", "--format=%H", f"--grep={LAZY_COMMIT_GREP}").split()
+        if not commits:
+            return None
+        folder = tempfile.mkdtemp()
+        for name in ["project5.py", "shot_feed.py"]:
+            with open(os.path.join(folder, name), "wb") as f:
+                f.write(git("show", f"{commits[0].decode()}^:./{name}"))
+        return folder
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_in_fresh_process(statement, path=HERE):
+    # a new interpreter per run so nothing is already imported or cached
+    code = (f"import sys, time; sys.path.insert(0, {path!r}); start = time.perf_counter(); "
+            f"{statement}; print(time.perf_counter() - start)")
+    return float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+
+
+def bench_cold_start():
+    eager_path = eager_checkout()
+    write_shots(SHOTS)
+    create_app = "import project5; project5.app"
+    first_page = "import project5; project5.serve_layout(); project5.display_page('/situations')"
+
+    print(f"Cold start with {SHOTS:,} synthetic shots")
+    if eager_path is None:
+        print("  previous eager import + app:        skipped (pre-lazy revision not found in git history)")
+    else:
+        print(f"  previous eager import + app:        {time_in_fresh_process(create_app, eager_path) * 1000:8.0f} ms")
+    print(f"  create app object (lazy):           {time_in_fresh_process(create_app) * 1000:8.0f} ms")
+    print(f"  first visit to one page:            {time_in_fresh_process(first_page) * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    bench_goal_count_payload()
+    bench_cold_start()
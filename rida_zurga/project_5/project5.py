@@ -7,99 +7,348 @@ Original file is located at
     https://colab.research.google.com/drive/1L49CrH4OdGOUZihjbLJjC5oBO3AWcGKF
 """
 
+import functools
+import os
+import threading
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import seaborn as sns
 import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash import dcc, html, Patch
+from dash.dependencies import Input, Output, State
 
-# read csv file
-df = pd.read_csv("fullshotsdata.csv")
+from shot_feed import ShotFeed
 
-# display first five rows
-df.head()
+SHOTS_FILE = "fullshotsdata.csv"
+FEED_INTERVAL_MS = 5000
 
-# create the necessary filtered dataframes
-goals_df = df[df['result'] == "Goal"]
-top_actions = goals_df['lastAction'].value_counts().nlargest(5).index
-filtered_goals = goals_df[goals_df['lastAction'].isin(top_actions)]
+# the dataset and everything derived from it is loaded on first use (see ensure_loaded),
+# so importing the module / creating the app stays cheap
+shot_feed = None
 
 # for plot 4:
-# create new column in df
-df['is_goal'] = df['result'] == "Goal"
-
-agg_df = df.groupby("minute", as_index=False)["is_goal"].mean()
+# keep per-minute shot and goal counts so new shots can be added without regrouping the history
+def minute_rates(counts):
+    return pd.DataFrame({"minute": counts.index, "is_goal": counts["goals"] / counts["shots"]}).reset_index(drop=True)
+
+# the same counts rolled up to coarser minute bins; rates are re-derived from counts, so every level is exact.
+# plot 4 shows the finest level that keeps the visible range under MAX_LINE_POINTS points;
+# a full match (about 96 minutes, up to 120 with extra time) stays at exact minutes
+PYRAMID_LEVELS = [1, 5, 15, 45]
+MAX_LINE_POINTS = 120
+
+def build_minute_pyramid(counts):
+    return {level: counts.groupby(counts.index // level * level)[["shots", "goals"]].sum() for level in PYRAMID_LEVELS}
+
+def pyramid_level(span):
+    # span is the visible number of minutes, None for the whole match
+    if span is None:
+        span = minute_counts.index.max() - minute_counts.index.min() + 1
+    for level in PYRAMID_LEVELS:
+        if span / level <= MAX_LINE_POINTS:
+            return level
+    return PYRAMID_LEVELS[-1]
+
+def zoomed_span(relayout):
+    # visible minutes from plot 4's relayoutData: a number, None when zoomed out, or False if the x axis did not change
+    relayout = relayout or {}
+    if "xaxis.range[0]" in relayout:
+        return relayout["xaxis.range[1]"] - relayout["xaxis.range[0]"]
+    if "xaxis.range" in relayout:
+        return relayout["xaxis.range"][1] - relayout["xaxis.range"][0]
+    if "xaxis.autorange" in relayout:
+        return None
+    return False
+
+# goal counts per category, cached per home/away filter
+# so the bar charts send a few aggregated rows instead of every goal record
+count_tables = {}
+
+def goal_counts(columns, selected_h_a=None):
+    key = (tuple(columns), selected_h_a)
+    if key not in count_tables:
+        source = goals_df if selected_h_a is None else goals_df[goals_df['h_a'] == selected_h_a]
+        counts = source.groupby(list(columns), observed=True).size().reset_index(name="count")
+        count_tables[key] = counts.sort_values("count", ascending=False, ignore_index=True)
+    return count_tables[key]
+
+def add_goal_counts(new_goals):
+    for (columns, selected_h_a), table in list(count_tables.items()):
+        source = new_goals if selected_h_a is None else new_goals[new_goals['h_a'] == selected_h_a]
+        if source.empty:
+            continue
+        new_counts = source.groupby(list(columns), observed=True).size().reset_index(name="count")
+        merged = pd.concat([table, new_counts]).groupby(list(columns), as_index=False)["count"].sum()
+        count_tables[(columns, selected_h_a)] = merged.sort_values("count", ascending=False, ignore_index=True)
 
 # for plot 5:
-# group by discussed categories
-combo_group = df.groupby(['h_a', 'situation', 'shotType']).agg(
-    total_shots=('is_goal', 'count'),
-    goals=('is_goal', 'sum')
-).reset_index()
-
-# calculate conversion rate
-combo_group['conversion_rate'] = combo_group['goals'] / combo_group['total_shots']
-
-
-# get the top five highest conversion combos
-top_combos = combo_group.sort_values('conversion_rate', ascending=False).head(5)
-
-# create combined label for plotting
-top_combos['combo'] = top_combos['h_a'] + " | " + top_combos['situation'] + " | " + top_combos['shotType']
-
-# create initial figures
-fig1 = px.bar(goals_df, x = "situation",
-              color = "h_a",
-              category_orders = {"situation": goals_df["situation"].value_counts().index})
-fig1.update_traces(dict(marker_line_width=0)) # fix color fading
-
-fig2 = px.bar(filtered_goals, x = "lastAction", color = "lastAction",
-              title = "Relationship Between Last Action and Goal Count",
-              labels={
-                  "lastAction": "Last Action",   # new x-axis label
-                  "count": "Goal Count"  # new y-axis label
-    })
-
-# add title and subtitle to fig 2
-fig2.update_layout(
-    title={
-        'text': "Relationship Between Last Action and Goal Count<br><sup>Passes and crosses lead to goals",
-        'x':0.5, 'xanchor': 'center'
-    }
-)
-fig2.update_traces(dict(marker_line_width=0)) # fix color fading
-
-
-
-fig3 = px.bar(goals_df, x = "shotType", color = "shotType",
-              color_discrete_sequence=px.colors.qualitative.Vivid,
-              labels={
-                  "shotType": "Body Part Used",   # new x-axis label
-                  "count": "Goal Count"  # new y-axis label
-              })
-
-# add title and subtitle to fig 3
-fig3.update_layout(
-    title={
-        'text': "Relationship Between Body Part and Goal Count<br><sup>Right foot creates goals",
-        'x':0.5, 'xanchor': 'center'
+# dense cube of shot and goal counts over every dimension the combo view can group by;
+# filters and regroupings become numpy slicing + summing instead of new groupbys
+MINUTE_BIN = 15
+cube_dims = ["h_a", "situation", "shotType", "lastAction", "minute_bin"]
+cube_dim_labels = {
+    "h_a": "Home/Away",
+    "situation": "Situation",
+    "shotType": "Shot Type",
+    "lastAction": "Last Action",
+    "minute_bin": "Minute"
+}
+default_combo_dims = ["h_a", "situation", "shotType"]
+
+def cube_columns(frame):
+    return {
+        "h_a": frame["h_a"],
+        "situation": frame["situation"],
+        "shotType": frame["shotType"],
+        "lastAction": frame["lastAction"].fillna("None"),
+        "minute_bin": frame["minute"] // MINUTE_BIN * MINUTE_BIN
     }
-)
-fig3.update_traces(dict(marker_line_width=0)) # fix color fading
 
-fig4 = px.line(agg_df, x = "minute", y = "is_goal")
-
-fig5 = px.bar(top_combos, x = "conversion_rate", y = "combo",
-              color = "combo",
-              color_discrete_sequence = px.colors.qualitative.Vivid)
+def add_to_cube(cube, frame):
+    # values not seen before get a new slot at the end of their axis
+    codes = []
+    for axis, (dim, values) in enumerate(cube_columns(frame).items()):
+        labels = cube["labels"][dim]
+        new_labels = sorted(set(values.unique()) - set(labels))
+        if new_labels:
+            labels.extend(new_labels)
+            padding = [(0, 0)] * len(cube_dims)
+            padding[axis] = (0, len(new_labels))
+            cube["shots"] = np.pad(cube["shots"], padding)
+            cube["goals"] = np.pad(cube["goals"], padding)
+        codes.append(pd.Categorical(values, categories=labels).codes)
+
+    shape = cube["shots"].shape
+    cells = np.ravel_multi_index(codes, shape)
+    size = int(np.prod(shape))
+    # swap in new arrays rather than adding in place, so concurrent readers never see half an update
+    cube["shots"] = cube["shots"] + np.bincount(cells, minlength=size).reshape(shape)
+    cube["goals"] = cube["goals"] + np.bincount(cells, weights=frame["is_goal"].to_numpy(), minlength=size).astype(np.int64).reshape(shape)
+    return cube
+
+def build_shot_cube(frame):
+    empty = np.zeros((0,) * len(cube_dims), dtype=np.int64)
+    cube = {"labels": {dim: [] for dim in cube_dims}, "shots": empty, "goals": empty.copy()}
+    return add_to_cube(cube, frame)
+
+def cube_label(dim, value):
+    if dim == "minute_bin":
+        return f"{value}-{value + MINUTE_BIN - 1}'"
+    return str(value)
+
+def cube_group(cube, group_dims, filters=None):
+    # filters pin a dimension to one value (None = all values); group_dims are kept, the rest summed out
+    filters = filters or {}
+    shots, goals = cube["shots"], cube["goals"]
+    labels = []
+    for axis, dim in enumerate(cube_dims):
+        dim_labels = cube["labels"][dim]
+        if filters.get(dim) is not None:
+            keep = [i for i, label in enumerate(dim_labels) if label == filters[dim]]
+            shots = np.take(shots, keep, axis=axis)
+            goals = np.take(goals, keep, axis=axis)
+            dim_labels = [dim_labels[i] for i in keep]
+        labels.append(dim_labels)
+
+    summed_axes = tuple(axis for axis, dim in enumerate(cube_dims) if dim not in group_dims)
+    shots = shots.sum(axis=summed_axes)
+    goals = goals.sum(axis=summed_axes)
+
+    kept = [(dim, labels[axis]) for axis, dim in enumerate(cube_dims) if dim in group_dims]
+    observed = np.nonzero(shots)
+    result = pd.DataFrame({
+        dim: np.asarray(dim_labels, dtype=object)[positions]
+        for (dim, dim_labels), positions in zip(kept, observed)
+    })
+    result["total_shots"] = shots[observed]
+    result["goals"] = goals[observed]
+    result["conversion_rate"] = result["goals"] / result["total_shots"]
+    return result
+
+def combo_labels(combos, group_dims):
+    dims = [dim for dim in cube_dims if dim in group_dims]
+    if combos.empty:
+        return pd.Series([], index=combos.index, dtype=object)
+    return combos[dims].apply(lambda row: " | ".join(cube_label(dim, row[dim]) for dim in dims), axis=1)
+
+def load_shots():
+    global shot_feed, goals_df, top_actions, minute_counts, agg_df, minute_pyramid, situation_order, shot_cube, combo_group, top_combos
+    # read csv file; the feed tails whatever comes after the rows read here
+    feed = ShotFeed(SHOTS_FILE, os.environ.get("SHOTS_DROP_DIR"))
+    df = feed.read_initial()
+
+    # create the necessary filtered dataframes
+    goals_df = df[df['result'] == "Goal"]
+    top_actions = goals_df['lastAction'].value_counts().nlargest(5).index
+
+    # create new column in df
+    df['is_goal'] = df['result'] == "Goal"
+
+    minute_counts = df.groupby("minute")["is_goal"].agg(shots="count", goals="sum")
+    agg_df = minute_rates(minute_counts)
+    minute_pyramid = build_minute_pyramid(minute_counts)
+
+    count_tables.clear()
+    situation_order = list(goal_counts(["situation"])["situation"])
+
+    shot_cube = build_shot_cube(df)
+    combo_group = cube_group(shot_cube, default_combo_dims)
+
+    # get the top five highest conversion combos
+    top_combos = combo_group.sort_values('conversion_rate', ascending=False).head(5)
+
+    # create combined label for plotting
+    top_combos['combo'] = combo_labels(top_combos, default_combo_dims)
+
+    # set last: other threads treat a non-None feed as "data is ready"
+    shot_feed = feed
+
+load_lock = threading.Lock()
+
+def ensure_loaded():
+    if shot_feed is None:
+        with load_lock:
+            if shot_feed is None:
+                load_shots()
+
+def with_shots(callback):
+    @functools.wraps(callback)
+    def wrapper(*args, **kwargs):
+        ensure_loaded()
+        return callback(*args, **kwargs)
+    return wrapper
+
+# live shot feed: new shots are folded into the aggregates above, and each version
+# remembers the previous conversion rate of the minutes it touched so plot 4 can be patched point by point
+feed_lock = threading.Lock()
+feed_version = 0
+feed_log = []
+FEED_LOG_SIZE = 500
+
+def ingest_shots(new):
+    global goals_df, minute_counts, agg_df, minute_pyramid, combo_group, feed_version
+    new = new.copy()
+    new['is_goal'] = new['result'] == "Goal"
+
+    new_minutes = new.groupby("minute")["is_goal"].agg(shots="count", goals="sum")
+    previous_rates = agg_df.set_index("minute")["is_goal"].reindex(new_minutes.index)
+    minute_counts = minute_counts.add(new_minutes, fill_value=0)
+    agg_df = minute_rates(minute_counts)
+    minute_pyramid = build_minute_pyramid(minute_counts)
+
+    add_to_cube(shot_cube, new)
+    combo_group = cube_group(shot_cube, default_combo_dims)
+
+    new_goals = new[new['is_goal']].drop(columns='is_goal')
+    goals_df = pd.concat([goals_df, new_goals], ignore_index=True)
+    add_goal_counts(new_goals)
+
+    feed_version += 1
+    feed_log.append((feed_version, previous_rates.to_dict()))
+    del feed_log[:-FEED_LOG_SIZE]
+
+def poll_shot_feed():
+    with feed_lock:
+        new = shot_feed.read_new()
+        if new is not None and not new.empty:
+            ingest_shots(new)
+        return feed_version
+
+def minute_changes_since(version):
+    # {minute: conversion rate before the first change after `version`}, or None if the log no longer reaches back
+    if feed_log and feed_log[0][0] > version + 1:
+        return None
+    changes = {}
+    for logged_version, previous_rates in feed_log:
+        if logged_version > version:
+            for minute, rate in previous_rates.items():
+                changes.setdefault(minute, rate)
+    return changes
+
+def minutes_in_range(rates, conversion_range):
+    return rates[(rates['is_goal'] >= conversion_range[0]) & (rates['is_goal'] <= conversion_range[1])]
+
+# page figures are built the first time their route is opened, then memoized
+# until the shot feed brings in new data
+def make_fig1():
+    fig1 = px.bar(goal_counts(["situation", "h_a"]), x = "situation", y = "count",
+                  color = "h_a",
+                  category_orders = {"situation": situation_order})
+    fig1.update_traces(dict(marker_line_width=0)) # fix color fading
+    return fig1
+
+def make_fig2():
+    action_counts = goal_counts(["lastAction"])
+    fig2 = px.bar(action_counts[action_counts["lastAction"].isin(top_actions)],
+                  x = "lastAction", y = "count", color = "lastAction",
+                  title = "Relationship Between Last Action and Goal Count",
+                  labels={
+                      "lastAction": "Last Action",   # new x-axis label
+                      "count": "Goal Count"  # new y-axis label
+        })
+
+    # add title and subtitle to fig 2
+    fig2.update_layout(
+        title={
+            'text': "Relationship Between Last Action and Goal Count<br><sup>Passes and crosses lead to goals",
+            'x':0.5, 'xanchor': 'center'
+        }
+    )
+    fig2.update_traces(dict(marker_line_width=0)) # fix color fading
+    return fig2
+
+def make_fig3():
+    fig3 = px.bar(goal_counts(["shotType"]), x = "shotType", y = "count", color = "shotType",
+                  color_discrete_sequence=px.colors.qualitative.Vivid,
+                  labels={
+                      "shotType": "Body Part Used",   # new x-axis label
+                      "count": "Goal Count"  # new y-axis label
+                  })
+
+    # add title and subtitle to fig 3
+    fig3.update_layout(
+        title={
+            'text': "Relationship Between Body Part and Goal Count<br><sup>Right foot creates goals",
+            'x':0.5, 'xanchor': 'center'
+        }
+    )
+    fig3.update_traces(dict(marker_line_width=0)) # fix color fading
+    return fig3
+
+def make_fig4():
+    return px.line(agg_df, x = "minute", y = "is_goal")
+
+def make_fig5():
+    return px.bar(top_combos, x = "conversion_rate", y = "combo",
+                  color = "combo",
+                  color_discrete_sequence = px.colors.qualitative.Vivid)
+
+page_builders = {
+    "situations": make_fig1,
+    "last-actions": make_fig2,
+    "shot-types": make_fig3,
+    "conversions": make_fig4,
+    "top-combos": make_fig5
+}
+page_figures = {}
+
+def page_figure(page):
+    ensure_loaded()
+    cached = page_figures.get(page)
+    if cached is None or cached[0] != feed_version:
+        cached = (feed_version, page_builders[page]())
+        page_figures[page] = cached
+    return cached[1]
 
 
 # initialize dash app and suppress callback exceptions
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 
-# create layout
-app.layout = html.Div([
+# create layout (served per page load, so the data is only read once someone visits)
+def serve_layout():
+  ensure_loaded()
+  return html.Div([
     html.H1("What Makes a Shot Go In?", style={"textAlign": "center", "backgroundColor": "white"}),
 
     # navigation links
@@ -149,26 +398,58 @@ app.layout = html.Div([
     ]),
 
 
+    # live shot feed polling
+    dcc.Interval(id="feed-interval", interval=FEED_INTERVAL_MS),
+    dcc.Store(id="feed-version", data={"version": feed_version, "since": feed_version}),
+
     # url + page container
     dcc.Location(id="url", refresh=False),
     html.Div(id="page-content") # placeholder that will hold the active page
 
     ])
 
+app.layout = serve_layout
+
 def layout_situations():
-  return html.Div([dcc.Graph(id="plot1", figure=fig1)])
+  return html.Div([dcc.Graph(id="plot1", figure=page_figure("situations"))])
 
 def layout_last_actions():
-  return html.Div([dcc.Graph(id="plot2", figure=fig2)])
+  return html.Div([dcc.Graph(id="plot2", figure=page_figure("last-actions"))])
 
 def layout_shot_types():
-  return html.Div([dcc.Graph(id="plot3", figure=fig3)])
+  return html.Div([dcc.Graph(id="plot3", figure=page_figure("shot-types"))])
 
 def layout_conversions():
-  return html.Div([dcc.Graph(id="plot4", figure=fig4)])
+  return html.Div([
+      html.Div([
+          html.Label("Minute resolution:"),
+          dcc.RadioItems(
+              id="minute-resolution",
+              options=[{"label": "Auto (follows zoom)", "value": "auto"}] +
+                      [{"label": f"{level} min", "value": level} for level in PYRAMID_LEVELS],
+              value="auto",
+              inline=True,
+              inputStyle={"marginLeft": "12px", "marginRight": "4px"}
+          )
+      ], style={"backgroundColor": "white", "padding": "8px"}),
+      dcc.Store(id="plot4-level"),
+      dcc.Graph(id="plot4", figure=page_figure("conversions"))
+  ])
 
 def layout_top_combos():
-  return html.Div([dcc.Graph(id="plot5", figure=fig5)])
+  return html.Div([
+      html.Div([
+          html.Label("Combine factors:"),
+          dcc.Checklist(
+              id="combo-dims",
+              options=[{"label": cube_dim_labels[dim], "value": dim} for dim in cube_dims],
+              value=default_combo_dims,
+              inline=True,
+              inputStyle={"marginLeft": "12px", "marginRight": "4px"}
+          )
+      ], style={"backgroundColor": "white", "padding": "8px"}),
+      dcc.Graph(id="plot5", figure=page_figure("top-combos"))
+  ])
 
 
 # callbacks
@@ -199,22 +480,18 @@ def display_page(pathname):
 # filter fig 1 based on dropdown home/away
 @app.callback(
     Output("plot1", "figure"),
-    Input("homeaway-dropdown", "value")
+    Input("homeaway-dropdown", "value"),
+    Input("feed-version", "data")
 )
-def update_fig1(selected_h_a):
-    # filter goals_df by home / away
-    filtered = goals_df[goals_df['h_a'] == selected_h_a]
-
-    # fallback to full dataframe if filtering is empty
-    if selected_h_a is None:
-      filtered = goals_df.copy()
-    else:
-      filtered = goals_df[goals_df['h_a'] == selected_h_a]
+@with_shots
+def update_fig1(selected_h_a, feed=None):
+    # goal counts for the home / away filter (all goals if nothing is selected)
+    counts = goal_counts(["situation", "h_a"], selected_h_a)
 
     # create updated figure
-    fig = px.bar(filtered, x="situation",
+    fig = px.bar(counts, x="situation", y="count",
                  color="h_a",
-                 category_orders = {"situation": goals_df["situation"].value_counts().index},
+                 category_orders = {"situation": situation_order},
                  title = "Relationship Between Situation and Goal Count")
 
     # add axis labels
@@ -230,24 +507,34 @@ def update_fig1(selected_h_a):
     fig.update_traces(marker_line_width=0)
     return fig
 
-# filter fig 4 based on conversion range
+# filter fig 4 based on conversion range, at the minute resolution that fits the zoom
 @app.callback(
     Output("plot4", "figure"),
-    Input("conversion-slider", "value")
+    Output("plot4-level", "data"),
+    Input("conversion-slider", "value"),
+    Input("plot4", "relayoutData"),
+    Input("minute-resolution", "value"),
+    State("plot4-level", "data")
 )
-def update_fig4(conversion_range):
-    filtered = agg_df.copy() # make a copy of the df to filter
+@with_shots
+def update_fig4(conversion_range, relayout=None, resolution="auto", shown_level=None):
+    span = zoomed_span(relayout)
+    zoomed = dash.callback_context.triggered_id == "plot4"
+    if zoomed and span is False:  # relayout that did not touch the x axis
+      return dash.no_update, dash.no_update
+    level = pyramid_level(span or None) if resolution == "auto" else resolution
+
+    # zooming within the same level needs no new data
+    if zoomed and level == shown_level:
+      return dash.no_update, dash.no_update
 
     # filter by conversion rate range
-    filtered = filtered[
-        (filtered['is_goal'] >= conversion_range[0]) &
-        (filtered['is_goal'] <= conversion_range[1])
-    ]
-
+    filtered = minutes_in_range(minute_rates(minute_pyramid[level]), conversion_range)
+    title = "Goal Conversion Rate by Exact Minute" if level == 1 else f"Goal Conversion Rate by {level}-Minute Bin"
 
     # create updated figure
     fig = px.line(filtered, x = "minute", y = "is_goal",
-               title = "Goal Conversion Rate by Exact Minute")
+               title = title)
 
     # add axis labels
     fig.update_xaxes(title_text="Minute")
@@ -255,26 +542,36 @@ def update_fig4(conversion_range):
 
     # add subtitle
     fig.update_layout(
-        title={'text': "Goal Conversion Rate by Exact Minute<br><sup>Late goals have high conversion rates</sup>",
-               'x':0.5}
+        title={'text': f"{title}<br><sup>Late goals have high conversion rates</sup>",
+               'x':0.5},
+        uirevision="plot4"  # keep the user's zoom when the resolution changes
     )
 
 
     fig.update_traces(mode="lines+markers", line=dict(width=2))
-    return fig
+
+    # plain lists (not typed arrays) so the live refresh can patch single points;
+    # plotly ignores re-assigning equal values, so clear the arrays first
+    fig.data[0].update(x=None, y=None)
+    fig.data[0].x = filtered['minute'].tolist()
+    fig.data[0].y = filtered['is_goal'].tolist()
+    return fig, level
 
 # filter fig 5 based on dropdowns
 @app.callback(
     Output("plot5", "figure"),
     Input("homeaway-dropdown", "value"),
-    Input("conversion-slider", "value")
+    Input("conversion-slider", "value"),
+    Input("combo-dims", "value"),
+    Input("feed-version", "data")
 )
-def update_fig5(selected_h_a, conversion_range):
-    # filter combo_group by home / away; fallback if nothing is selected
-    if selected_h_a is None:
-      filtered = combo_group.copy()
-    else:
-      filtered = combo_group[combo_group['h_a'] == selected_h_a]
+@with_shots
+def update_fig5(selected_h_a, conversion_range, group_dims, feed=None):
+    # fall back to the default combination if every factor is unticked
+    group_dims = group_dims or default_combo_dims
+
+    # slice the shot cube by home / away (all shots if nothing is selected) and sum out the other factors
+    filtered = cube_group(shot_cube, group_dims, {"h_a": selected_h_a})
 
     # filter by conversion rate range
     filtered = filtered[
@@ -287,7 +584,7 @@ def update_fig5(selected_h_a, conversion_range):
 
     # create combined label
     top_filtered = top_filtered.copy()
-    top_filtered['combo'] = top_filtered['h_a'] + " | " + top_filtered['situation'] + " | " + top_filtered['shotType']
+    top_filtered['combo'] = combo_labels(top_filtered, group_dims)
 
     # fallback to full dataframe if filtering gives empty
     if filtered.empty:
@@ -312,6 +609,76 @@ def update_fig5(selected_h_a, conversion_range):
     fig.update_traces(marker_line_width=0)
     return fig
 
+# poll the shot feed; clients only hear about versions they have not seen yet
+@app.callback(
+    Output("feed-version", "data"),
+    Input("feed-interval", "n_intervals"),
+    State("feed-version", "data"),
+    prevent_initial_call=True
+)
+@with_shots
+def update_feed_version(n_intervals, feed):
+    version = poll_shot_feed()
+    if version == feed["version"]:
+      return dash.no_update
+    return {"version": version, "since": feed["version"]}
+
+# refresh the count bar charts from the incrementally updated count tables
+@app.callback(
+    Output("plot2", "figure"),
+    Input("feed-version", "data"),
+    prevent_initial_call=True
+)
+@with_shots
+def update_fig2(feed):
+    return page_figure("last-actions")
+
+@app.callback(
+    Output("plot3", "figure"),
+    Input("feed-version", "data"),
+    prevent_initial_call=True
+)
+@with_shots
+def update_fig3(feed):
+    return page_figure("shot-types")
+
+# send only the conversion-by-minute points that changed since the client's last version
+@app.callback(
+    Output("plot4", "figure", allow_duplicate=True),
+    Input("feed-version", "data"),
+    State("conversion-slider", "value"),
+    State("plot4-level", "data"),
+    prevent_initial_call=True
+)
+@with_shots
+def refresh_fig4(feed, conversion_range, level=1):
+    level = level or 1
+    rates = minute_rates(minute_pyramid[level])
+    visible = minutes_in_range(rates, conversion_range)
+    changes = minute_changes_since(feed["since"])
+
+    patched = Patch()
+    # per-point patches track exact minutes; coarser levels resend their (short) line
+    if changes is not None and level == 1:
+      # rebuild the set of points the client is showing from the rates it last saw
+      before = rates.set_index("minute")["is_goal"].copy()
+      for minute, rate in changes.items():
+        before[minute] = rate
+      before = minutes_in_range(before.dropna().rename("is_goal").reset_index(), conversion_range)
+
+      if list(before['minute']) == list(visible['minute']):
+        positions = {minute: i for i, minute in enumerate(visible['minute'])}
+        current = visible.set_index("minute")["is_goal"]
+        for minute in changes:
+          if minute in positions:
+            patched['data'][0]['y'][positions[minute]] = float(current[minute])
+        return patched
+
+    # points entered or left the slider range: resend the line
+    patched['data'][0]['x'] = visible['minute'].tolist()
+    patched['data'][0]['y'] = visible['is_goal'].tolist()
+    return patched
+
 # run the app
 if __name__ == "__main__":
   app.run(debug=True)
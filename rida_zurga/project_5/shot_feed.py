@@ -0,0 +1,59 @@
+import io
+import os
+
+import pandas as pd
+
+
+# local stand-in for a live shot feed: tails rows appended to the shots CSV
+# and picks up new CSV files dropped into an (optional) folder
+class ShotFeed:
+    def __init__(self, path, drop_dir=None):
+        self.path = path
+        self.drop_dir = drop_dir
+        self.seen_files = set()
+        self.header = b""
+        self.offset = 0
+
+    def read_initial(self):
+        # the initial load and the tail share one boundary: the file's bytes are read once and
+        # cut at the last complete line, so a row is either in this frame or read later, never both
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.header = data[:data.find(b"\n") + 1]
+        self.offset = data.rfind(b"\n") + 1
+        return pd.read_csv(io.BytesIO(data[:self.offset]))
+
+    def read_new(self):
+        frames = [frame for frame in [self._read_appended()] + self._read_dropped() if frame is not None]
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+    def _read_appended(self):
+        size = os.path.getsize(self.path)
+        if size < self.offset:  # file was replaced or truncated, start tailing from its end
+            self.offset = size
+            return None
+        if size == self.offset:
+            return None
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        # only consume complete lines, a partially written row is picked up next time
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self.offset += end
+        return pd.read_csv(io.BytesIO(self.header + chunk[:end]))
+
+    def _read_dropped(self):
+        if not self.drop_dir or not os.path.isdir(self.drop_dir):
+            return []
+        frames = []
+        # files should be moved into the folder once complete (write elsewhere, then rename)
+        for name in sorted(os.listdir(self.drop_dir)):
+            if name.endswith(".csv") and name not in self.seen_files:
+                self.seen_files.add(name)
+                frames.append(pd.read_csv(os.path.join(self.drop_dir, name)))
+        return frames
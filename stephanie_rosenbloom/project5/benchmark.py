@@ -0,0 +1,101 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from dash import Patch
+from plotly.io.json import to_json_plotly
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+import project5
+
+ROWS = 2_000_000
+LOOKUPS = 200
+SESSIONS = 300
+INTERACTIONS_PER_SESSION = 3
+
+
+def synthetic_panel(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'Country': [f"Country {i:07d}" for i in range(rows)]})
+    frame['Score'] = rng.uniform(2.5, 8.0, rows).round(3)
+    for factor in project5.core_factors:
+        frame[factor] = rng.uniform(0, 1.6, rows).round(3)
+    return frame
+
+
+def time_per_call(fn, args):
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - start) / len(args) * 1000
+
+
+def bench_country_lookup():
+    frame = synthetic_panel(ROWS)
+    picks = frame['Country'].sample(LOOKUPS, random_state=1).tolist()
+
+    def scan(country):
+        row = frame[frame['Country'] == country].iloc[0]
+        return row, frame[frame['Score'] >= row['Score']].shape[0]
+
+    start = time.perf_counter()
+    index = project5.build_country_index(frame)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def indexed(country):
+        pos = index['positions'][country]
+        return frame.iloc[pos], int(index['rank'][pos])
+
+    for country in picks[:5]:
+        assert scan(country)[1] == indexed(country)[1]
+
+    scan_ms = time_per_call(scan, picks[:20])
+    indexed_ms = time_per_call(indexed, picks)
+    print(f"Country lookup on {ROWS:,} rows")
+    print(f"  index build (once): {build_ms:9.1f} ms")
+    print(f"  boolean scan:       {scan_ms:9.3f} ms/lookup")
+    print(f"  country index:      {indexed_ms:9.3f} ms/lookup")
+    print(f"  speedup:            {scan_ms / indexed_ms:9.0f}x")
+
+
+def full_response(trace_updates, skeleton):
+    return to_json_plotly(project5.fill_figure(skeleton, trace_updates))
+
+
+def patch_response(trace_updates, skeleton):
+    patched = Patch()
+    project5.patch_traces(patched, trace_updates)
+    return to_json_plotly(patched.to_plotly_json())
+
+
+def bench_patch_updates():
+    dataset = project5.get_dataset(project5.default_year)
+    rng = np.random.default_rng(0)
+    factors = project5.core_factors
+    interactions = [
+        (int(rng.choice(project5.top_n_options)), factors[rng.integers(len(factors))])
+        for _ in range(SESSIONS * INTERACTIONS_PER_SESSION)
+    ]
+
+    def interact(respond, top_n, factor):
+        start = time.perf_counter()
+        size = len(respond(project5.stacked_bar_updates(dataset, top_n), project5.stacked_bar_figure))
+        size += len(respond(project5.scatter_updates(dataset, top_n, factor), project5.scatter_figures['single']))
+        return size, (time.perf_counter() - start) * 1000
+
+    print(f"Stacked bar + scatter update, {SESSIONS} concurrent sessions x {INTERACTIONS_PER_SESSION} interactions")
+    for label, respond in [('full figure', full_response), ('Patch', patch_response)]:
+        with ThreadPoolExecutor(max_workers=SESSIONS) as pool:
+            results = list(pool.map(lambda args: interact(respond, *args), interactions))
+        sizes = np.array([size for size, _ in results])
+        latencies = np.array([latency for _, latency in results])
+        print(f"  {label:12s} {sizes.mean() / 1024:7.1f} KB/interaction   "
+              f"p50 {np.percentile(latencies, 50):7.2f} ms   p95 {np.percentile(latencies, 95):7.2f} ms")
+
+
+if __name__ == '__main__':
+    bench_country_lookup()
+    bench_patch_updates()
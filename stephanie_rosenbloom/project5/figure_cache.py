@@ -0,0 +1,139 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def normalize_key(*parts):
+    # lists (e.g. selected components) are order-insensitive, so sort them into tuples
+    return tuple(tuple(sorted(part)) if isinstance(part, (list, tuple, set)) else part for part in parts)
+
+
+def make_private_dir(path):
+    # entries are unpickled on read, so only this user may write to the directory
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, 'getuid') and os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f'figure cache directory {path} is owned by another user')
+    os.chmod(path, 0o700)
+
+
+class FigureCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, disk_max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if disk_dir:
+            make_private_dir(disk_dir)
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        payload = self._read_disk(key)
+        if payload is not None:
+            value = pickle.loads(payload)
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(key, value, len(payload))
+            return value
+
+        value = build()
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.misses += 1
+        self._remember(key, value, len(payload))
+        self._write_disk(key, payload)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remember(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f'{digest}.pkl')
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+            # a hit makes the entry the newest, so eviction by mtime is least recently used first
+            os.utime(path)
+            return payload
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key, payload):
+        if not self.disk_dir:
+            return
+        # write then rename so other workers never read a half-written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, self._disk_path(key))
+        self._trim_disk()
+
+    def _trim_disk(self):
+        # drop the oldest entries (by mtime) until the directory fits in disk_max_bytes;
+        # other workers may be trimming too, so files can vanish underneath us
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.disk_evictions += 1
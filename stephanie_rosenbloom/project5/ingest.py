@@ -0,0 +1,99 @@
+import os
+import re
+
+import pandas as pd
+
+SOURCE_DIR = '.'
+STORE_DIR = 'happiness_store'
+
+schema = [
+    'Country',
+    'Score',
+    'GDP per capita',
+    'Social support',
+    'Healthy life expectancy',
+    'Freedom',
+    'Generosity',
+    'Perceptions of corruption'
+]
+
+# the yearly World Happiness files name the same measures differently (2015-16, 2017, 2018-19)
+column_aliases = {
+    'Country': 'Country',
+    'Country or region': 'Country',
+    'Score': 'Score',
+    'Happiness Score': 'Score',
+    'Happiness.Score': 'Score',
+    'GDP per capita': 'GDP per capita',
+    'Economy (GDP per Capita)': 'GDP per capita',
+    'Economy..GDP.per.Capita.': 'GDP per capita',
+    'Social support': 'Social support',
+    'Family': 'Social support',
+    'Healthy life expectancy': 'Healthy life expectancy',
+    'Health (Life Expectancy)': 'Healthy life expectancy',
+    'Health..Life.Expectancy.': 'Healthy life expectancy',
+    'Freedom': 'Freedom',
+    'Freedom to make life choices': 'Freedom',
+    'Generosity': 'Generosity',
+    'Perceptions of corruption': 'Perceptions of corruption',
+    'Trust (Government Corruption)': 'Perceptions of corruption',
+    'Trust..Government.Corruption.': 'Perceptions of corruption'
+}
+
+def source_files(source_dir=SOURCE_DIR):
+    files = {}
+    for name in os.listdir(source_dir):
+        match = re.fullmatch(r'(\d{4})\.csv', name)
+        if match:
+            files[int(match.group(1))] = os.path.join(source_dir, name)
+    return files
+
+def partition_path(year, store_dir=STORE_DIR):
+    return os.path.join(store_dir, f'year={year}', 'data.parquet')
+
+def stored_years(store_dir=STORE_DIR):
+    if not os.path.isdir(store_dir):
+        return []
+    years = []
+    for name in os.listdir(store_dir):
+        match = re.fullmatch(r'year=(\d{4})', name)
+        if match:
+            years.append(int(match.group(1)))
+    return years
+
+def available_years(source_dir=SOURCE_DIR, store_dir=STORE_DIR):
+    return sorted(set(source_files(source_dir)) | set(stored_years(store_dir)))
+
+def normalize(frame):
+    frame = frame.rename(columns=column_aliases)
+    missing = [column for column in schema if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Happiness file is missing columns: {missing}")
+
+    frame = frame[schema].copy()
+    for column in schema[1:]:
+        frame[column] = pd.to_numeric(frame[column], errors='coerce')
+    return frame.sort_values('Score', ascending=False, ignore_index=True)
+
+def ingest(source_dir=SOURCE_DIR, store_dir=STORE_DIR):
+    years = []
+    for year, path in sorted(source_files(source_dir).items()):
+        target = partition_path(year, store_dir)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        normalize(pd.read_csv(path)).to_parquet(target, index=False)
+        years.append(year)
+    return years
+
+def load_year(year, source_dir=SOURCE_DIR, store_dir=STORE_DIR):
+    target = partition_path(year, store_dir)
+    source = source_files(source_dir).get(year)
+    # fall back to the raw CSV when the store has not been (re)built since the file changed
+    if os.path.exists(target) and (source is None or os.path.getmtime(target) >= os.path.getmtime(source)):
+        return pd.read_parquet(target)
+    if source is None:
+        raise FileNotFoundError(f"No World Happiness data for {year}")
+    return normalize(pd.read_csv(source))
+
+if __name__ == '__main__':
+    written = ingest()
+    print(f"Wrote {len(written)} year partition(s) to {STORE_DIR}: {written}")
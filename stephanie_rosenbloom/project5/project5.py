@@ -1,23 +1,15 @@
+import os
+
 import dash
-from dash import dcc, html, Input, Output, State, callback_context
+from dash import dcc, html, Input, Output, State, Patch
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 
-df = pd.read_csv('2019.csv')
-
-df.rename(columns={
-    'Country or region': 'Country',
-    'Score': 'Score',
-    'GDP per capita': 'GDP per capita',
-    'Social support': 'Social support',
-    'Healthy life expectancy': 'Healthy life expectancy',
-    'Freedom to make life choices': 'Freedom',
-    'Generosity': 'Generosity',
-    'Perceptions of corruption': 'Perceptions of corruption'
-}, inplace=True)
+from figure_cache import FigureCache, normalize_key
+from ingest import available_years, load_year
 
 core_factors = [
     'GDP per capita',
@@ -40,8 +32,130 @@ component_colors = {
     'Others': '#A1483D'
 }
 
-df['Residual'] = df['Score'] - df[core_factors].sum(axis=1)
 all_components = core_factors + ['Residual']
+comparison_factors = ['Score'] + core_factors
+top_n_options = [5, 10, 15, 20, 30]
+
+def build_country_index(frame):
+    scores = frame['Score'].to_numpy()
+    sorted_scores = np.sort(scores)
+    # rank = number of countries scoring at least as high (tied countries share the worst rank of their group)
+    rank = len(scores) - np.searchsorted(sorted_scores, scores, side='left')
+    positions = dict(zip(frame['Country'].tolist(), range(len(frame))))
+    return {'positions': positions, 'rank': rank}
+
+def build_reference_stats(frame):
+    stats = {}
+    for factor in comparison_factors:
+        stats[factor] = {
+            'global': frame[factor].mean(),
+            'top': {n: frame.nlargest(n, 'Score')[factor].mean() for n in top_n_options},
+            'bottom': {n: frame.nsmallest(n, 'Score')[factor].mean() for n in top_n_options}
+        }
+    return stats
+
+TREND_POINTS = 100
+TREND_Z = 1.96  # normal approximation to the 95% interval
+
+def fit_trendlines(frame, factors):
+    x = frame[factors].to_numpy(dtype=float)
+    y = frame['Score'].to_numpy(dtype=float)[:, None]
+    w = ~np.isnan(x)
+    x = np.where(w, x, 0.0)
+    y = np.where(w, y, 0.0)
+
+    # normal equations for every factor at once: [[Sxx, Sx], [Sx, n]] @ [slope, intercept] = [Sxy, Sy]
+    n = w.sum(axis=0)
+    sx, sy = x.sum(axis=0), y.sum(axis=0)
+    sxx, sxy = (x * x).sum(axis=0), (x * y).sum(axis=0)
+    lhs = np.stack([np.stack([sxx, sx], axis=-1), np.stack([sx, n], axis=-1)], axis=-2)
+    rhs = np.stack([sxy, sy], axis=-1)[..., None]
+    slope, intercept = np.linalg.solve(lhs, rhs)[..., 0].T
+
+    resid = np.where(w, y - (slope * x + intercept), 0.0)
+    sigma2 = (resid ** 2).sum(axis=0) / np.maximum(n - 2, 1)
+    x_mean = sx / n
+    sxx_centered = sxx - n * x_mean ** 2
+
+    x_min = np.where(w, x, np.inf).min(axis=0)
+    x_max = np.where(w, x, -np.inf).max(axis=0)
+    x_trend = np.linspace(x_min, x_max, TREND_POINTS).T
+    y_trend = slope[:, None] * x_trend + intercept[:, None]
+    se = np.sqrt(sigma2[:, None] * (1 / n[:, None] + (x_trend - x_mean[:, None]) ** 2 / sxx_centered[:, None]))
+
+    return {
+        factor: {
+            'x': x_trend[i],
+            'y': y_trend[i],
+            'lower': y_trend[i] - TREND_Z * se[i],
+            'upper': y_trend[i] + TREND_Z * se[i]
+        }
+        for i, factor in enumerate(factors)
+    }
+
+trendline_cache = {}
+
+def get_trendline(dataset, factor):
+    key = (factor, dataset['version'])
+    if key not in trendline_cache:
+        trendline_cache[key] = fit_trendlines(dataset['df'], [factor])[factor]
+    return trendline_cache[key]
+
+years = available_years()
+default_year = years[-1]
+
+# years are loaded on first use so startup cost does not grow with the number of years
+datasets = {}
+data_version = 0
+
+def load_data(year):
+    global data_version
+    frame = load_year(year)
+    frame['Residual'] = frame['Score'] - frame[core_factors].sum(axis=1)
+
+    previous = datasets.get(year)
+    if previous is not None:
+        for factor in core_factors:
+            trendline_cache.pop((factor, previous['version']), None)
+
+    data_version += 1
+    dataset = {
+        'df': frame,
+        'version': data_version,
+        # content hash, identical in every worker process, for keys in the shared figure cache
+        'fingerprint': int(pd.util.hash_pandas_object(frame, index=False).sum()),
+        'country_index': build_country_index(frame),
+        'factor_matrix': frame[core_factors].to_numpy(dtype=float),
+        'factor_max': np.nanmax(frame[core_factors].to_numpy(dtype=float), axis=0),
+        'reference_stats': build_reference_stats(frame),
+        # the frame comes sorted by Score (ingest.normalize), so list position is the rank
+        'radar_options': [{'label': f"#{i+1} {country}", 'value': country}
+                          for i, country in enumerate(frame['Country'])]
+    }
+    for factor, fit in fit_trendlines(frame, core_factors).items():
+        trendline_cache[(factor, data_version)] = fit
+    datasets[year] = dataset
+    return dataset
+
+def get_dataset(year):
+    if year not in datasets:
+        load_data(year)
+    return datasets[year]
+
+MAX_RADAR_COUNTRIES = 20
+radar_colors = px.colors.qualitative.Dark24
+
+def country_profiles(dataset, countries):
+    positions = dataset['country_index']['positions']
+    countries = [country for country in dict.fromkeys(countries) if country in positions][:MAX_RADAR_COUNTRIES]
+    rows = np.fromiter((positions[country] for country in countries), dtype=np.intp, count=len(countries))
+    return countries, dataset['factor_matrix'][rows]
+
+def lookup_country(dataset, selected_country):
+    pos = dataset['country_index']['positions'].get(selected_country)
+    if pos is None:
+        return None, None
+    return dataset['df'].iloc[pos], int(dataset['country_index']['rank'][pos])
 
 component_definitions = {
     'GDP per capita': 'GDP per capita: Economic output per person - measures the standard of living and economic prosperity',
@@ -53,11 +167,220 @@ component_definitions = {
     'Residual': 'Unexplained Factors: Unexplained happiness - factors not captured by the other components'
 }
 
+def component_toggle_style(component, is_selected):
+    return {
+        'backgroundColor': component_colors[component] if is_selected else 'white',
+        'color': 'white' if is_selected else component_colors[component],
+        'borderColor': component_colors[component]
+    }
+
+def create_component_toggles(selected_components):
+    buttons = []
+    for component in all_components:
+        definition = component_definitions.get(component, '')
+        
+        buttons.append(
+            html.Button(
+                component.replace('Perceptions of corruption', 'Corruption'),
+                id={'type': 'component-toggle', 'index': component},
+                className='toggle-button',
+                style=component_toggle_style(component, component in selected_components),
+                title=definition
+            )
+        )
+    
+    return buttons
+
+def hover_template(factor):
+    return ('<b>%{text}</b><br>' + 
+            f'{factor}: %{{x:.3f}}<br>' +
+            'Happiness Score: %{y:.3f}<extra></extra>')
+
+def figure_layout(**overrides):
+    layout = dict(
+        height=550,
+        margin=dict(t=60, b=80, l=80, r=60),
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        xaxis=dict(
+            gridcolor='#f0f0f0',
+            gridwidth=1,
+            showgrid=True
+        ),
+        yaxis=dict(
+            gridcolor='#f0f0f0',
+            gridwidth=1,
+            showgrid=True
+        )
+    )
+    layout.update(overrides)
+    return layout
+
+def build_stacked_bar_skeleton():
+    fig = go.Figure()
+    
+    for component in all_components:
+        fig.add_trace(go.Bar(
+            name=component.replace('Perceptions of corruption', 'Corruption'),
+            marker_color=component_colors[component],
+            meta=component
+        ))
+    
+    fig.update_layout(**figure_layout(
+        barmode='stack',
+        title="",
+        xaxis_title="Country",
+        yaxis_title="Score Component Value",
+        xaxis_tickangle=-45,
+        showlegend=False
+    ))
+    
+    return fig
+
+def build_scatter_skeleton(mode):
+    fig = go.Figure()
+    
+    if mode == 'all':
+        for comp in core_factors:
+            fig.add_trace(go.Scatter(
+                mode='markers',
+                name=comp.replace('Perceptions of corruption', 'Corruption'),
+                marker=dict(color=component_colors[comp], size=10, opacity=0.8),
+                hovertemplate=hover_template(comp),
+                meta=comp
+            ))
+    else:
+        fig.add_trace(go.Scatter(
+            mode='markers',
+            name='Other Countries',
+            marker=dict(color=component_colors['Others'], size=6, opacity=0.4)
+        ))
+        
+        fig.add_trace(go.Scatter(
+            mode='markers',
+            marker=dict(color=component_colors['Top Countries'], size=12)
+        ))
+        
+        fig.add_trace(go.Scatter(
+            fill='toself',
+            fillcolor='rgba(255, 107, 107, 0.15)',
+            line=dict(width=0),
+            name='95% Confidence Band',
+            hoverinfo='skip'
+        ))
+        
+        fig.add_trace(go.Scatter(
+            mode='lines',
+            name='Trend Line',
+            line=dict(color='#FF6B6B', width=3, dash='dash'),
+            hoverinfo='skip'
+        ))
+    
+    fig.update_layout(**figure_layout(
+        xaxis_title="Factor Values",
+        yaxis_title="Happiness Score",
+        hovermode='closest',
+        margin=dict(t=80, b=100, l=80, r=60),
+        showlegend=mode != 'all',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom", 
+            y=-0.25,
+            xanchor="center",
+            x=0.5
+        ) if mode != 'all' else None
+    ))
+    
+    return fig
+
+def scatter_mode(component):
+    return 'all' if component == 'all' else 'single'
+
+# figure skeletons are built once; callbacks only send the per-trace data that changes
+stacked_bar_figure = build_stacked_bar_skeleton()
+scatter_figures = {mode: build_scatter_skeleton(mode) for mode in ['all', 'single']}
+
+def stacked_bar_updates(dataset, top_n):
+    top_countries = dataset['df'].nlargest(top_n, 'Score')
+    countries = top_countries['Country'].to_numpy()
+    return [{'x': countries, 'y': top_countries[component].to_numpy()} for component in all_components]
+
+def scatter_updates(dataset, top_n, component):
+    df = dataset['df']
+    top_countries = df.nlargest(top_n, 'Score')
+    
+    if component == 'all':
+        return [
+            {
+                'x': top_countries[comp].to_numpy(),
+                'y': top_countries['Score'].to_numpy(),
+                'text': top_countries['Country'].to_numpy()
+            }
+            for comp in core_factors
+        ]
+    
+    other_countries = df.drop(top_countries.index)
+    trend = get_trendline(dataset, component)
+    return [
+        {
+            'x': other_countries[component].to_numpy(),
+            'y': other_countries['Score'].to_numpy(),
+            'text': other_countries['Country'].to_numpy(),
+            'hovertemplate': hover_template(component)
+        },
+        {
+            'x': top_countries[component].to_numpy(),
+            'y': top_countries['Score'].to_numpy(),
+            'text': top_countries['Country'].to_numpy(),
+            'name': f'Top {top_n}',
+            'hovertemplate': hover_template(component)
+        },
+        {
+            'x': np.concatenate([trend['x'], trend['x'][::-1]]),
+            'y': np.concatenate([trend['upper'], trend['lower'][::-1]])
+        },
+        {
+            'x': trend['x'],
+            'y': trend['y']
+        }
+    ]
+
+def fill_figure(skeleton, trace_updates):
+    fig = go.Figure(skeleton)
+    for trace, update in zip(fig.data, trace_updates):
+        trace.update(update)
+    return fig
+
+def patch_traces(patched, trace_updates):
+    for i, update in enumerate(trace_updates):
+        for key, value in update.items():
+            patched['data'][i][key] = value
+
+def build_scatter_figure(mode, trace_updates, selected_components, title, x_title):
+    fig = fill_figure(scatter_figures[mode], trace_updates)
+    if mode == 'all':
+        for trace in fig.data:
+            trace.visible = trace.meta in selected_components
+    fig.update_layout(title=title, xaxis_title=x_title)
+    return fig
+
+# shared across sessions; set FIGURE_CACHE_DIR to let several gunicorn workers (same user) share one disk tier
+figure_cache = FigureCache(
+    max_bytes=int(os.environ.get('FIGURE_CACHE_MB', '64')) * 1024 * 1024,
+    disk_dir=os.environ.get('FIGURE_CACHE_DIR'),
+    disk_max_bytes=int(os.environ.get('FIGURE_CACHE_DISK_MB', '256')) * 1024 * 1024
+)
+
+toggle_styles = {
+    component: {'on': component_toggle_style(component, True), 'off': component_toggle_style(component, False)}
+    for component in all_components
+}
+
 app = dash.Dash(__name__)
 
 app.layout = html.Div([
     html.Div([
-        html.H1("World Happiness Report 2019", 
+        html.H1(id='report-title', children=f"World Happiness Report {default_year}", 
                 style={'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': '8px', 'fontSize': '2.2em', 'fontWeight': '600'}),
         html.P("What Makes a Nation Truly Happy? Discover the Factors That Create the World’s Happiest Societies",
                style={'textAlign': 'center', 'color': '#666', 'fontSize': '16px', 'maxWidth': '800px', 'margin': '0 auto', 'lineHeight': '1.4'})
@@ -75,17 +398,20 @@ app.layout = html.Div([
     
     html.Div([
         html.Div([
+            html.Label("Select a year", style={'fontWeight': 'bold', 'marginRight': '15px', 'fontSize': '14px'}),
+            dcc.Dropdown(
+                id='year-dropdown',
+                options=[{'label': str(year), 'value': year} for year in years],
+                value=default_year,
+                clearable=False,
+                style={'width': '120px', 'fontSize': '14px'}
+            ),
             html.Label("Select a sample size", style={'fontWeight': 'bold', 'marginRight': '15px', 'fontSize': '14px'}),
             dcc.Dropdown(
                 id='row1-top-n-dropdown',
-                options=[
-                    {'label': 'Top 5 Countries', 'value': 5},
-                    {'label': 'Top 10 Countries', 'value': 10},
-                    {'label': 'Top 15 Countries', 'value': 15},
-                    {'label': 'Top 20 Countries', 'value': 20},
-                    {'label': 'Top 30 Countries', 'value': 30}
-                ],
+                options=[{'label': f'Top {n} Countries', 'value': n} for n in top_n_options],
                 value=10,
+                clearable=False,
                 style={'width': '180px', 'fontSize': '14px'}
             )
         ], style={'display': 'flex', 'alignItems': 'center', 'gap': '15px', 'justifyContent': 'center'})
@@ -100,7 +426,7 @@ app.layout = html.Div([
     html.Div([
         html.Div([
             html.H3("Factors of Happiness", style={'textAlign': 'center', 'marginBottom': '8px', 'color': '#2c3e50', 'fontSize': '1.1em'}),
-            dcc.Graph(id='stacked-bar-chart', style={'height': '550px'})
+            dcc.Graph(id='stacked-bar-chart', figure=stacked_bar_figure, style={'height': '550px'})
         ], style={
             'flex': '2',
             'background': 'white',
@@ -113,7 +439,7 @@ app.layout = html.Div([
         html.Div([
             html.H4("Happiness Factors Filter", style={'textAlign': 'center', 'marginBottom': '8px', 'color': '#2c3e50', 'fontSize': '13px'}),
             html.P("Toggle happiness factors on/off", style={'textAlign': 'center', 'fontSize': '11px', 'color': '#666', 'marginBottom': '12px', 'lineHeight': '1.2'}),
-            html.Div(id='component-toggles', style={'display': 'flex', 'flexDirection': 'column', 'gap': '3px'})
+            html.Div(create_component_toggles(all_components), id='component-toggles', style={'display': 'flex', 'flexDirection': 'column', 'gap': '3px'})
         ], style={
             'flex': '0.6',
             'background': 'white',
@@ -145,7 +471,7 @@ app.layout = html.Div([
                     style={'width': '100%', 'fontSize': '14px'}
                 )
             ], style={'background': '#f8f9fa', 'padding': '8px', 'borderRadius': '8px', 'marginBottom': '8px'}),
-            dcc.Graph(id='scatter-plot', style={'height': '550px'})
+            dcc.Graph(id='scatter-plot', figure=scatter_figures['single'], style={'height': '550px'})
         ], style={
             'flex': '2',
             'background': 'white',
@@ -184,6 +510,15 @@ app.layout = html.Div([
     html.Div([
         html.Div([
             html.H3("Country Component Profile", style={'textAlign': 'center', 'marginBottom': '8px', 'color': '#2c3e50', 'fontSize': '1.1em'}),
+            html.Div([
+                html.Label("Overlay other countries:", style={'fontWeight': 'bold', 'marginBottom': '6px', 'display': 'block', 'fontSize': '13px'}),
+                dcc.Dropdown(
+                    id='radar-compare-dropdown',
+                    multi=True,
+                    placeholder=f"Add up to {MAX_RADAR_COUNTRIES - 1} countries...",
+                    style={'width': '100%', 'fontSize': '14px'}
+                )
+            ], style={'background': '#f8f9fa', 'padding': '8px', 'borderRadius': '8px', 'marginBottom': '8px'}),
             dcc.Graph(id='radar-chart', style={'height': '450px'})
         ], style={
             'flex': '1.2',
@@ -239,7 +574,10 @@ app.layout = html.Div([
         'marginBottom': '30px'
     }),
     
-    dcc.Store(id='selected-components', data=all_components)
+    dcc.Store(id='selected-components', data=all_components),
+    dcc.Store(id='scatter-mode', data='single'),
+    dcc.Store(id='component-toggle-styles', data=toggle_styles),
+    dcc.Store(id='radar-compare-full', data=False)
     
 ], style={
     'fontFamily': 'Helvetica',
@@ -329,214 +667,139 @@ app.index_string = '''
 </html>
 '''
 
+@app.callback(
+    Output('report-title', 'children'),
+    Input('year-dropdown', 'value')
+)
+def update_report_title(year):
+    return f"World Happiness Report {year}"
+
 @app.callback(
     Output('country-dropdown', 'options'),
-    Input('row1-top-n-dropdown', 'value')
+    [Input('row1-top-n-dropdown', 'value'),
+     Input('year-dropdown', 'value')]
 )
-def update_country_dropdown(top_n):
+def update_country_dropdown(top_n, year):
+    df = get_dataset(year)['df']
     top_30_countries = df.nlargest(30, 'Score')
     return [{'label': f"#{i+1} {country}", 'value': country} 
             for i, country in enumerate(top_30_countries['Country'])]
 
 @app.callback(
-    Output('component-toggles', 'children'),
-    Input('selected-components', 'data')
+    [Output('radar-compare-dropdown', 'options'),
+     Output('radar-compare-full', 'data')],
+    [Input('year-dropdown', 'value'),
+     Input('radar-compare-dropdown', 'value')],
+    State('radar-compare-full', 'data')
 )
-def create_component_toggles(selected_components):
-    buttons = []
-    for component in all_components:
-        is_selected = component in selected_components
-        button_style = {
-            'backgroundColor': component_colors[component] if is_selected else 'white',
-            'color': 'white' if is_selected else component_colors[component],
-            'borderColor': component_colors[component]
+def update_radar_compare_dropdown(year, compared_countries, was_full):
+    # a pick only changes the options when it takes the selection to or from the limit
+    full = len(compared_countries or []) >= MAX_RADAR_COUNTRIES - 1
+    if dash.ctx.triggered_id == 'radar-compare-dropdown' and full == was_full:
+        return dash.no_update, dash.no_update
+    options = get_dataset(year)['radar_options']
+    if full:
+        compared = set(compared_countries)
+        options = [dict(option, disabled=option['value'] not in compared) for option in options]
+    return options, full
+
+app.clientside_callback(
+    """
+    function(n_clicks, selected, toggleStyles, barFigure, scatterFigure) {
+        const ctx = dash_clientside.callback_context;
+        if (!ctx.triggered.length || !ctx.triggered[0].value) {
+            return [dash_clientside.no_update, dash_clientside.no_update,
+                    dash_clientside.no_update, dash_clientside.no_update];
         }
-        
-        definition = component_definitions.get(component, '')
-        
-        buttons.append(
-            html.Button(
-                component.replace('Perceptions of corruption', 'Corruption'),
-                id={'type': 'component-toggle', 'index': component},
-                className='toggle-button',
-                style=button_style,
-                title=definition
-            )
-        )
-    
-    return buttons
+        const propId = ctx.triggered[0].prop_id;
+        const component = JSON.parse(propId.slice(0, propId.lastIndexOf('.'))).index;
+        const order = Object.keys(toggleStyles);
+        const isOn = selected.includes(component);
+        const nowSelected = isOn ? selected.filter(c => c !== component)
+                                 : order.filter(c => c === component || selected.includes(c));
 
-@app.callback(
-    Output('selected-components', 'data'),
-    [Input({'type': 'component-toggle', 'index': dash.ALL}, 'n_clicks')],
-    [State('selected-components', 'data')]
+        const setVisible = figure => {
+            if (!figure) { return dash_clientside.no_update; }
+            const data = figure.data.map(trace =>
+                trace.meta === component ? Object.assign({}, trace, {visible: !isOn}) : trace);
+            return Object.assign({}, figure, {data: data});
+        };
+        const styles = order.map(c => toggleStyles[c][nowSelected.includes(c) ? 'on' : 'off']);
+        return [nowSelected, styles, setVisible(barFigure), setVisible(scatterFigure)];
+    }
+    """,
+    [Output('selected-components', 'data'),
+     Output({'type': 'component-toggle', 'index': dash.ALL}, 'style'),
+     Output('stacked-bar-chart', 'figure', allow_duplicate=True),
+     Output('scatter-plot', 'figure', allow_duplicate=True)],
+    Input({'type': 'component-toggle', 'index': dash.ALL}, 'n_clicks'),
+    [State('selected-components', 'data'),
+     State('component-toggle-styles', 'data'),
+     State('stacked-bar-chart', 'figure'),
+     State('scatter-plot', 'figure')],
+    prevent_initial_call=True
 )
-def toggle_component(n_clicks, selected_components):
-    ctx = callback_context
-    if not ctx.triggered:
-        return selected_components
-    
-    button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-    component = eval(button_id)['index']
-    
-    if component in selected_components:
-        selected_components.remove(component)
-    else:
-        selected_components.append(component)
-    
-    return selected_components
 
 @app.callback(
     Output('stacked-bar-chart', 'figure'),
     [Input('row1-top-n-dropdown', 'value'),
-     Input('selected-components', 'data')]
+     Input('year-dropdown', 'value')]
 )
-def update_stacked_bar_chart(top_n, selected_components):
-    top_countries = df.nlargest(top_n, 'Score')
-    
-    fig = go.Figure()
-    
-    for component in selected_components:
-        if component in top_countries.columns:
-            fig.add_trace(go.Bar(
-                name=component.replace('Perceptions of corruption', 'Corruption'),
-                x=top_countries['Country'],
-                y=top_countries[component],
-                marker_color=component_colors[component]
-            ))
-    
-    fig.update_layout(
-        barmode='stack',
-        title="",
-        xaxis_title="Country",
-        yaxis_title="Score Component Value",
-        xaxis_tickangle=-45,
-        height=550,
-        margin=dict(t=60, b=80, l=80, r=60),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        showlegend=False,
-        xaxis=dict(
-            gridcolor='#f0f0f0',
-            gridwidth=1,
-            showgrid=True
-        ),
-        yaxis=dict(
-            gridcolor='#f0f0f0',
-            gridwidth=1,
-            showgrid=True
-        )
+def update_stacked_bar_chart(top_n, year):
+    dataset = get_dataset(year)
+    trace_updates = figure_cache.get_or_build(
+        normalize_key('stacked-bar', dataset['fingerprint'], top_n),
+        lambda: stacked_bar_updates(dataset, top_n)
     )
-    
-    return fig
+    patched = Patch()
+    patch_traces(patched, trace_updates)
+    return patched
 
 @app.callback(
-    Output('scatter-plot', 'figure'),
+    [Output('scatter-plot', 'figure'),
+     Output('scatter-mode', 'data')],
     [Input('row1-top-n-dropdown', 'value'),
      Input('scatter-component-dropdown', 'value'),
-     Input('selected-components', 'data')]
+     Input('year-dropdown', 'value')],
+    [State('selected-components', 'data'),
+     State('scatter-mode', 'data')]
 )
-def update_scatter_plot(top_n, component, selected_components):
-    top_countries = df.nlargest(top_n, 'Score')
-    top_countries_list = top_countries['Country'].tolist()
-    other_countries = df[~df['Country'].isin(top_countries_list)]
-    
-    fig = go.Figure()
-    
-    if component == 'all':
-        for comp in selected_components:
-            if comp in core_factors:
-                fig.add_trace(go.Scatter(
-                    x=top_countries[comp],
-                    y=top_countries['Score'],
-                    mode='markers',
-                    name=comp.replace('Perceptions of corruption', 'Corruption'),
-                    marker=dict(color=component_colors[comp], size=10, opacity=0.8),
-                    text=top_countries['Country'],
-                    hovertemplate='<b>%{text}</b><br>' + 
-                                 f'{comp}: %{{x:.3f}}<br>' +
-                                 'Happiness Score: %{y:.3f}<extra></extra>'
-                ))
-    else:
-        fig.add_trace(go.Scatter(
-            x=other_countries[component],
-            y=other_countries['Score'],
-            mode='markers',
-            name='Other Countries',
-            marker=dict(color=component_colors['Others'], size=6, opacity=0.4),
-            text=other_countries['Country'],
-            hovertemplate='<b>%{text}</b><br>' + 
-                         f'{component}: %{{x:.3f}}<br>' +
-                         'Happiness Score: %{y:.3f}<extra></extra>'
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=top_countries[component],
-            y=top_countries['Score'],
-            mode='markers',
-            name=f'Top {top_n}',
-            marker=dict(color=component_colors['Top Countries'], size=12),
-            text=top_countries['Country'],
-            hovertemplate='<b>%{text}</b><br>' + 
-                         f'{component}: %{{x:.3f}}<br>' +
-                         'Happiness Score: %{y:.3f}<extra></extra>'
-        ))
-        
-        x_vals = df[component].dropna()
-        y_vals = df['Score'][df[component].notna()]
-        z = np.polyfit(x_vals, y_vals, 1)
-        p = np.poly1d(z)
-        x_trend = np.linspace(x_vals.min(), x_vals.max(), 100)
-        
-        fig.add_trace(go.Scatter(
-            x=x_trend,
-            y=p(x_trend),
-            mode='lines',
-            name='Trend Line',
-            line=dict(color='#FF6B6B', width=3, dash='dash'),
-            hoverinfo='skip'
-        ))
-    
-    title = f"Selected Factors vs Score (Top {top_n})" if component == 'all' else f"{component} vs Happiness Score"
-    x_title = "Factor Values" if component == 'all' else component
+def update_scatter_plot(top_n, component, year, selected_components, rendered_mode):
+    mode = scatter_mode(component)
+    dataset = get_dataset(year)
+    trace_updates = figure_cache.get_or_build(
+        normalize_key('scatter', dataset['fingerprint'], top_n, component),
+        lambda: scatter_updates(dataset, top_n, component)
+    )
+    title = f"Selected Factors vs Score (Top {top_n})" if mode == 'all' else f"{component} vs Happiness Score"
+    x_title = "Factor Values" if mode == 'all' else component
     
-    fig.update_layout(
-        title=title,
-        xaxis_title=x_title,
-        yaxis_title="Happiness Score",
-        height=550,
-        hovermode='closest',
-        margin=dict(t=80, b=100, l=80, r=60),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        showlegend=False if component == 'all' else True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom", 
-            y=-0.25,
-            xanchor="center",
-            x=0.5
-        ) if component != 'all' else None,
-        xaxis=dict(
-            gridcolor='#f0f0f0',
-            gridwidth=1,
-            showgrid=True
-        ),
-        yaxis=dict(
-            gridcolor='#f0f0f0',
-            gridwidth=1,
-            showgrid=True
+    # switching between the 'all' and single-factor views changes the trace list, so resend the skeleton
+    if mode != rendered_mode:
+        # trace visibility only depends on the selection in the 'all factors' view
+        selection = selected_components if mode == 'all' else []
+        fig = figure_cache.get_or_build(
+            normalize_key('scatter-figure', dataset['fingerprint'], top_n, component, selection),
+            lambda: build_scatter_figure(mode, trace_updates, selection, title, x_title)
         )
-    )
+        return fig, mode
     
-    return fig
+    patched = Patch()
+    patch_traces(patched, trace_updates)
+    patched['layout']['title']['text'] = title
+    patched['layout']['xaxis']['title']['text'] = x_title
+    return patched, dash.no_update
 
 @app.callback(
     Output('radar-chart', 'figure'),
-    Input('country-dropdown', 'value')
+    [Input('country-dropdown', 'value'),
+     Input('radar-compare-dropdown', 'value'),
+     Input('year-dropdown', 'value')]
 )
-def update_radar_chart(selected_country):
-    if not selected_country:
+def update_radar_chart(selected_country, compared_countries, year):
+    dataset = get_dataset(year)
+    countries, profiles = country_profiles(dataset, [selected_country] + (compared_countries or []))
+    if selected_country not in countries:
         fig = go.Figure()
         fig.add_annotation(
             text="Select a country to see its profile",
@@ -552,15 +815,12 @@ def update_radar_chart(selected_country):
         )
         return fig
     
-    country_data = df[df['Country'] == selected_country].iloc[0]
-    
     categories = [comp.replace('Perceptions of corruption', 'Corruption') for comp in core_factors]
-    values = [country_data[comp] for comp in core_factors]
     
     fig = go.Figure()
     
     fig.add_trace(go.Scatterpolar(
-        r=values,
+        r=profiles[0],
         theta=categories,
         fill='toself',
         fillcolor='rgba(108, 198, 164, 0.3)',
@@ -568,11 +828,21 @@ def update_radar_chart(selected_country):
         name=selected_country
     ))
     
+    for i, (country, values) in enumerate(zip(countries[1:], profiles[1:])):
+        fig.add_trace(go.Scatterpolar(
+            r=values,
+            theta=categories,
+            line=dict(color=radar_colors[i % len(radar_colors)], width=2),
+            name=country
+        ))
+    
+    title = selected_country if len(countries) == 1 else f"{selected_country} vs {len(countries) - 1} other(s)"
+    
     fig.update_layout(
         polar=dict(
             radialaxis=dict(
                 visible=True,
-                range=[0, max(values) * 1.2] if values else [0, 2],
+                range=[0, float(np.nanmax(dataset['factor_max'])) * 1.2],
                 gridcolor='#f0f0f0',
                 gridwidth=1,
                 tickangle=0,
@@ -585,9 +855,9 @@ def update_radar_chart(selected_country):
             ),
             bgcolor='white'
         ),
-        title=f"{selected_country}",
+        title=title,
         height=450,
-        showlegend=False,
+        showlegend=len(countries) > 1,
         margin=dict(t=60, b=40, l=40, r=40),
         plot_bgcolor='white',
         paper_bgcolor='white'
@@ -597,10 +867,12 @@ def update_radar_chart(selected_country):
 
 @app.callback(
     Output('country-data-chart', 'children'),
-    Input('country-dropdown', 'value')
+    [Input('country-dropdown', 'value'),
+     Input('year-dropdown', 'value')]
 )
-def update_country_data_chart(selected_country):
-    if not selected_country:
+def update_country_data_chart(selected_country, year):
+    country_data, rank = lookup_country(get_dataset(year), selected_country)
+    if country_data is None:
         return html.Div([
             html.Div("Select a country to see detailed data", 
                    style={
@@ -614,8 +886,6 @@ def update_country_data_chart(selected_country):
                    })
         ])
     
-    country_data = df[df['Country'] == selected_country].iloc[0]
-    rank = df[df['Score'] >= country_data['Score']].shape[0]
     
     data_items = [
         {'label': 'Rank', 'value': f"#{rank}", 'color': '#e74c3c'},
@@ -685,10 +955,14 @@ def update_country_data_chart(selected_country):
 @app.callback(
     Output('comparison-bar-chart', 'figure'),
     [Input('country-dropdown', 'value'),
-     Input('comparison-factor-dropdown', 'value')]
+     Input('comparison-factor-dropdown', 'value'),
+     Input('row1-top-n-dropdown', 'value'),
+     Input('year-dropdown', 'value')]
 )
-def update_comparison_bar_chart(selected_country, selected_factor):
-    if not selected_country:
+def update_comparison_bar_chart(selected_country, selected_factor, top_n, year):
+    dataset = get_dataset(year)
+    country_data, _ = lookup_country(dataset, selected_country)
+    if country_data is None:
         fig = go.Figure()
         fig.add_annotation(
             text="Select a country for comparison",
@@ -704,21 +978,27 @@ def update_comparison_bar_chart(selected_country, selected_factor):
         )
         return fig
     
-    country_data = df[df['Country'] == selected_country].iloc[0]
-    global_avg = df[selected_factor].mean()
-    top10_avg = df.nlargest(10, 'Score')[selected_factor].mean()
-    bottom10_avg = df.nsmallest(10, 'Score')[selected_factor].mean()
+    return figure_cache.get_or_build(
+        normalize_key('comparison', dataset['fingerprint'], selected_country, selected_factor, top_n),
+        lambda: build_comparison_figure(dataset, country_data, selected_country, selected_factor, top_n)
+    )
+
+def build_comparison_figure(dataset, country_data, selected_country, selected_factor, top_n):
+    factor_stats = dataset['reference_stats'][selected_factor]
+    global_avg = factor_stats['global']
+    top_avg = factor_stats['top'][top_n]
+    bottom_avg = factor_stats['bottom'][top_n]
     
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        x=[selected_country, 'Global Avg', 'Top 10 Avg', 'Bottom 10 Avg'],
-        y=[country_data[selected_factor], global_avg, top10_avg, bottom10_avg],
+        x=[selected_country, 'Global Avg', f'Top {top_n} Avg', f'Bottom {top_n} Avg'],
+        y=[country_data[selected_factor], global_avg, top_avg, bottom_avg],
         marker_color=[component_colors['Top Countries'], 
                      component_colors['Others'], 
                      '#3498db',
                      '#e74c3c'],
-        text=[f"{val:.3f}" for val in [country_data[selected_factor], global_avg, top10_avg, bottom10_avg]],
+        text=[f"{val:.3f}" for val in [country_data[selected_factor], global_avg, top_avg, bottom_avg]],
         textposition='auto'
     ))
     
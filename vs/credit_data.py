@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+#Schema for the Credit_Data CSVs (project_4 spells the credit limit column with "individual's")
+category_columns=["Number of Cards owned per person","Gender","Student","Married","Ethnicity"]
+money_columns=[
+    "Annual Income(in thousands of dollars)",
+    "Credit Limit(individual credit card account)",
+    "Credit Limit(individual's credit card account)",
+    "Current Balance in credit card account"
+]
+integer_columns=["ID","Credit Rating","Age","Number of years of Education"]
+
+MTIME_KEY=b"source_mtime_ns"
+
+def cache_path(path):
+    return os.path.splitext(path)[0]+".parquet"
+
+def read_typed_csv(path):
+    #categories are parsed as strings, so the number of cards comes out as discrete labels
+    header=pd.read_csv(path,nrows=0).columns
+    dtypes={column:"category" for column in category_columns if column in header}
+    dtypes.update({column:"float32" for column in money_columns if column in header})
+    frame=pd.read_csv(path,dtype=dtypes)
+    for column in integer_columns:
+        if column in frame.columns:
+            frame[column]=pd.to_numeric(frame[column],downcast="integer")
+    return frame
+
+def load_credit_data(path):
+    #read the columnar copy next to the CSV, rebuilding it whenever the CSV's mtime changes
+    source_mtime=str(os.stat(path).st_mtime_ns).encode()
+    cache=cache_path(path)
+    if os.path.exists(cache) and (pq.read_schema(cache).metadata or {}).get(MTIME_KEY)==source_mtime:
+        return pd.read_parquet(cache)
+
+    frame=read_typed_csv(path)
+    table=pa.Table.from_pandas(frame,preserve_index=False)
+    table=table.replace_schema_metadata({**table.schema.metadata,MTIME_KEY:source_mtime})
+    #write to a file of our own then rename, so a second worker never reads (or writes into) a half-written copy
+    fd,tmp_path=tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache)),suffix=".tmp")
+    with os.fdopen(fd,"wb") as f:
+        pq.write_table(table,f)
+    os.replace(tmp_path,cache)
+    return frame
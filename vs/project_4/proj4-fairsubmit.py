@@ -2,13 +2,24 @@ import dash
 import dash_bootstrap_components as dbc
 from dash import dcc,Input, Output,html
 import plotly.express as px
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import os
+import importlib.util
 
+#credit_data.py is shared by project_4 and project_5 and sits one folder up in vs/;
+#these scripts are run directly rather than as a package, so load it from its path
+def import_shared(name):
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)),"..",name+".py")
+    spec=importlib.util.spec_from_file_location(name,path)
+    module=importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
-credit_card= pd.read_csv('Credit_Data_updated.csv')
-credit_card["Number of Cards owned per person"]=credit_card["Number of Cards owned per person"].astype(str)
+load_credit_data=import_shared("credit_data").load_credit_data
+
+
+credit_card= load_credit_data('Credit_Data_updated.csv')
 
 
 
@@ -48,9 +59,13 @@ def update_distribution(selected_gender):
     if filtered_df.empty:
         return{}
     
+    #income is stored as float32; plot it as float64 at the CSV's precision so the JSON stays short
+    income='Annual Income(in thousands of dollars)'
+    filtered_df = filtered_df.assign(**{income: filtered_df[income].astype("float64").round(3)})
+    
     fig1=px.scatter(
         filtered_df,
-        x='Annual Income(in thousands of dollars)',
+        x=income,
         y='Credit Rating',
         color='Number of Cards owned per person',
         symbol='Gender',
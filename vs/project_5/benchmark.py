@@ -0,0 +1,133 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SIZES = [10_000, 1_000_000, 10_000_000]
+DRAG_ROWS = 5_000_000
+LOAD_ROWS = 5_000_000
+
+x = "Credit Limit(individual credit card account)"
+y = "Current Balance in credit card account"
+
+
+def load_dashboard(workdir=HERE):
+    # the dashboard file name has spaces in it, so it can't be imported by name
+    os.chdir(workdir)
+    spec = importlib.util.spec_from_file_location("dashboard", os.path.join(HERE, "project5-FairCopy - Submit.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_ccard(rows, seed=0):
+    # same columns as Credit_Data_updated1.csv, with roughly the same ranges
+    rng = np.random.default_rng(seed)
+    limit = rng.gamma(4, 1200, rows).round()
+    return pd.DataFrame({
+        "ID": np.arange(1, rows + 1),
+        "Annual Income(in thousands of dollars)": rng.gamma(2.5, 18, rows).round(3),
+        x: limit,
+        "Credit Rating": (limit / 13 + rng.normal(0, 20, rows)).round(),
+        "Number of Cards owned per person": rng.integers(1, 10, rows).astype(str),
+        "Age": rng.integers(23, 99, rows),
+        "Number of years of Education": rng.integers(5, 21, rows),
+        "Gender": rng.choice(["Male", "Female"], rows),
+        "Student": rng.choice(["No", "Yes"], rows, p=[0.9, 0.1]),
+        "Married": rng.choice(["Yes", "No"], rows, p=[0.61, 0.39]),
+        "Ethnicity": rng.choice(["Caucasian", "Asian", "African American"], rows, p=[0.5, 0.25, 0.25]),
+        y: np.maximum(limit * 0.15 + rng.normal(0, 400, rows), 0).round(),
+    })
+
+
+def write_ccard(rows):
+    # the dashboard reads Credit_Data_updated1.csv from the working directory
+    workdir = tempfile.mkdtemp()
+    synthetic_ccard(rows).to_csv(os.path.join(workdir, "Credit_Data_updated1.csv"), index=False)
+    return workdir
+
+
+def time_to_payload(build):
+    # server side part of first paint: build the figure and serialize the response
+    start = time.perf_counter()
+    payload = build().to_json()
+    return (time.perf_counter() - start) * 1000, len(payload) / 1024 / 1024
+
+
+def bench_scatter_render():
+    dashboard = load_dashboard()
+    px.scatter(synthetic_ccard(100), x=x, y=y, color="Gender").to_json()  # warm up plotly's imports
+    print("Customer scatter (colored by Gender): build + serialize, response size")
+    for rows in SIZES:
+        frame = synthetic_ccard(rows)
+        paths = [("svg px.scatter", lambda: px.scatter(frame, x=x, y=y, color="Gender")),
+                 ("scatter_figure", lambda: dashboard.scatter_figure(frame, x=x, y=y, color="Gender"))]
+        for label, build in paths:
+            ms, mb = time_to_payload(build)
+            print(f"  {rows:>10,} rows  {label:15s} {ms:9.0f} ms {mb:9.2f} MB")
+
+
+def bench_education_drag():
+    dashboard = load_dashboard(write_ccard(DRAG_ROWS))
+    years = dashboard.column_arrays[dashboard.education_years]
+
+    def mask_per_move(gender, slider_value):
+        # the previous path: boolean mask over the gender partition on every slider move
+        rows = dashboard.matching_rows({"Gender": gender})
+        rows = rows[years[rows] <= slider_value]
+        return dashboard.scatter_figure(dashboard.columns_at(rows, dashboard.credit_limit, dashboard.current_balance),
+                                        x=dashboard.credit_limit, y=dashboard.current_balance)
+
+    # one drag across the whole slider and back, for everyone and for one gender
+    steps = list(range(years.min(), years.max() + 1))
+    drag = [(gender, value) for gender in [None, "Female"] for value in steps + steps[::-1]]
+
+    print(f"Education slider drag on {DRAG_ROWS:,} synthetic rows ({len(drag)} moves)")
+    for label, move in [("mask per move", mask_per_move), ("prefix index", dashboard.update_financialbehavioreducation)]:
+        latencies = []
+        for gender, value in drag:
+            start = time.perf_counter()
+            move(gender, value).to_json()
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"  {label:14s} p50 {np.percentile(latencies, 50):8.1f} ms   p95 {np.percentile(latencies, 95):8.1f} ms")
+
+
+def load_in_fresh_process(workdir, statement):
+    # a new interpreter per run so the peak RSS (VmHWM, Linux only) covers just this load;
+    # pandas is imported before the clock starts
+    code = ("import sys, time; import pandas as pd; "
+            f"sys.path.insert(0, {os.path.dirname(HERE)!r}); from credit_data import load_credit_data; "
+            "hwm = lambda: int(open('/proc/self/status').read().split('VmHWM:')[1].split()[0]); "
+            "baseline = hwm(); start = time.perf_counter(); "
+            f"frame = {statement}; elapsed = time.perf_counter() - start; "
+            "print(elapsed, baseline, hwm(), frame.memory_usage(deep=True).sum())")
+    out = subprocess.run([sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True, check=True).stdout
+    elapsed, baseline, peak, frame_bytes = map(float, out.split())
+    return elapsed * 1000, baseline / 1024, peak / 1024, frame_bytes / 1024 / 1024
+
+
+def bench_typed_load():
+    workdir = write_ccard(LOAD_ROWS)
+    current = ("pd.read_csv('Credit_Data_updated1.csv').astype("
+               "{'Number of Cards owned per person': str})")
+    typed = "load_credit_data('Credit_Data_updated1.csv')"
+
+    print(f"Loading Credit_Data_updated1.csv with {LOAD_ROWS:,} synthetic rows")
+    # the first typed load parses the CSV and writes the columnar copy, the second reads that copy
+    for label, statement in [("read_csv + astype(str)", current), ("typed, first load", typed),
+                             ("typed, cached copy", typed)]:
+        ms, baseline, peak, frame_mb = load_in_fresh_process(workdir, statement)
+        print(f"  {label:22s} {ms:8.0f} ms   peak RSS {peak:7.0f} MB (+{peak - baseline:5.0f} MB)   frame {frame_mb:6.0f} MB")
+
+
+if __name__ == "__main__":
+    bench_scatter_render()
+    bench_education_drag()
+    bench_typed_load()
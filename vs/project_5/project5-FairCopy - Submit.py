@@ -3,13 +3,166 @@ import dash_bootstrap_components as dbc
 from dash import dcc,html,Input,Output
 import plotly.express as px
 import pandas as pd
+import numpy as np
+import os
+import importlib.util
 
-ccard= pd.read_csv('Credit_Data_updated1.csv')
+#credit_data.py is shared by project_4 and project_5 and sits one folder up in vs/;
+#these scripts are run directly rather than as a package, so load it from its path
+def import_shared(name):
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)),"..",name+".py")
+    spec=importlib.util.spec_from_file_location(name,path)
+    module=importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
-ccard["Number of Cards owned per person"]=ccard["Number of Cards owned per person"].astype(str)
+load_credit_data=import_shared("credit_data").load_credit_data
+
+ccard= load_credit_data('Credit_Data_updated1.csv')
 
 num_records=len(ccard)
 
+#Filter index
+#one packed bitmap (1 bit per customer) per value of each filter column; callbacks AND the
+#bitmaps of their selections into row positions and read only the columns they plot
+filter_columns=["Gender","Ethnicity","Student","Married"]
+
+def build_filter_index(frame):
+    index={}
+    for column in filter_columns:
+        codes,values=pd.factorize(frame[column])
+        index[column]={value:np.packbits(codes==code) for code,value in enumerate(values)}
+    return index
+
+filter_index=build_filter_index(ccard)
+no_rows=np.zeros((num_records+7)//8,dtype=np.uint8)
+column_arrays={column:ccard[column].to_numpy() for column in ccard.columns}
+
+def matching_rows(filters):
+    selected=[filter_index[column].get(value,no_rows) for column,value in filters.items() if value]
+    if not selected:
+        return np.arange(num_records)
+    bits=selected[0]
+    for bitmap in selected[1:]:
+        bits=bits&bitmap
+    return np.flatnonzero(np.unpackbits(bits,count=num_records))
+
+def columns_at(rows,*columns):
+    return {column:column_arrays[column][rows] for column in columns}
+
+#Scatter render path
+#SVG draws every marker as a DOM node, so larger frames switch to WebGL and very large
+#frames are binned server side: one marker per occupied grid cell and color group,
+#sized by the number of customers in it, so dense regions stay dense and outliers stay visible
+WEBGL_ROWS=5_000
+BINNED_ROWS=200_000
+SCATTER_BINS=150
+
+SCATTER_CELLS=SCATTER_BINS*SCATTER_BINS
+
+def scatter_grid(xs,ys):
+    x_lo,y_lo=xs.min(),ys.min()
+    return x_lo,(xs.max()-x_lo)/SCATTER_BINS or 1.0,y_lo,(ys.max()-y_lo)/SCATTER_BINS or 1.0
+
+def grid_cells(xs,ys,grid):
+    x_lo,x_width,y_lo,y_width=grid
+    x_bin=np.minimum(((xs-x_lo)/x_width).astype(np.int64),SCATTER_BINS-1)
+    y_bin=np.minimum(((ys-y_lo)/y_width).astype(np.int64),SCATTER_BINS-1)
+    return x_bin*SCATTER_BINS+y_bin
+
+def binned_points(counts,grid,x,y,color=None,groups=None):
+    #counts holds one block of SCATTER_CELLS cell counts per color group
+    x_lo,x_width,y_lo,y_width=grid
+    occupied=np.flatnonzero(counts)
+    binned=pd.DataFrame({
+        x:x_lo+(occupied%SCATTER_CELLS//SCATTER_BINS+0.5)*x_width,
+        y:y_lo+(occupied%SCATTER_BINS+0.5)*y_width,
+        "Customers":counts[occupied]
+    })
+    if color:
+        binned[color]=np.asarray(groups)[occupied//SCATTER_CELLS]
+    return binned
+
+def bin_points(data,x,y,color=None):
+    xs=np.asarray(data[x],dtype=float)
+    ys=np.asarray(data[y],dtype=float)
+    grid=scatter_grid(xs,ys)
+    cell=grid_cells(xs,ys,grid)
+    groups=None
+    if color:
+        codes,groups=pd.factorize(data[color])
+        cell=codes*SCATTER_CELLS+cell
+    counts=np.bincount(cell,minlength=(len(groups) if color else 1)*SCATTER_CELLS)
+    return binned_points(counts,grid,x,y,color,groups)
+
+def binned_figure(binned,x,y,color=None,**kwargs):
+    return px.scatter(binned,x=x,y=y,color=color,size="Customers",size_max=12,render_mode="webgl",**kwargs)
+
+def scatter_figure(data,x,y,color=None,**kwargs):
+    #data is a DataFrame or a dict of equal length column arrays
+    if len(data[x])>BINNED_ROWS:
+        return binned_figure(bin_points(data,x,y,color),x,y,color,**kwargs)
+    render_mode="webgl" if len(data[x])>WEBGL_ROWS else "svg"
+    return px.scatter(data,x=x,y=y,color=color,render_mode=render_mode,**kwargs)
+
+#Education slider index
+#per gender partition (None = everyone) the row positions sorted by years of education, so any
+#slider threshold is a searchsorted prefix; partitions too big to plot point by point also keep
+#cumulative grid counts per education level, so a drag only slices a precomputed summary
+credit_limit="Credit Limit(individual credit card account)"
+current_balance="Current Balance in credit card account"
+education_years="Number of years of Education"
+
+def build_education_index():
+    index={}
+    for gender in [None]+list(filter_index["Gender"]):
+        rows=matching_rows({"Gender":gender})
+        rows=rows[np.argsort(column_arrays[education_years][rows],kind="stable")]
+        partition={"rows":rows,"years":column_arrays[education_years][rows]}
+        if len(rows)>BINNED_ROWS:
+            xs=column_arrays[credit_limit][rows].astype(float)
+            ys=column_arrays[current_balance][rows].astype(float)
+            grid=scatter_grid(xs,ys)
+            levels,level_of_row=np.unique(partition["years"],return_inverse=True)
+            counts=np.bincount(level_of_row*SCATTER_CELLS+grid_cells(xs,ys,grid),minlength=len(levels)*SCATTER_CELLS)
+            partition.update(grid=grid,levels=levels,
+                             cumulative=counts.reshape(len(levels),SCATTER_CELLS).cumsum(axis=0))
+        index[gender]=partition
+    return index
+
+education_index=build_education_index()
+
+#Demographics cube
+#customer counts for every Married x Ethnicity x Gender x Student cell, built once; the marital
+#status chart slices and sums it, and keeps each filter's aggregate so switching chart type is free
+cube_columns=["Married","Ethnicity","Gender","Student"]
+
+def build_demographics_cube(frame):
+    codes,labels=[],{}
+    for column in cube_columns:
+        column_codes,values=pd.factorize(frame[column],sort=True)
+        codes.append(column_codes)
+        labels[column]=list(values)
+    shape=tuple(len(labels[column]) for column in cube_columns)
+    known=np.logical_and.reduce([column_codes>=0 for column_codes in codes])  #groupby skips missing values too
+    cells=np.ravel_multi_index([column_codes[known] for column_codes in codes],shape)
+    return {"counts":np.bincount(cells,minlength=int(np.prod(shape))).reshape(shape),"labels":labels}
+
+demographics_cube=build_demographics_cube(ccard)
+ethnicity_counts={}
+
+def counts_by_ethnicity(selected_condition):
+    if selected_condition not in ethnicity_counts:
+        counts,labels=demographics_cube["counts"],demographics_cube["labels"]
+        if selected_condition:
+            married=labels["Married"]
+            counts=counts[married.index(selected_condition)] if selected_condition in married else np.zeros_like(counts[0])
+        else:
+            counts=counts.sum(axis=0)
+        finance_df=pd.DataFrame({"Ethnicity":labels["Ethnicity"],"Count":counts.sum(axis=(1,2))})
+        ethnicity_counts[selected_condition]=finance_df[finance_df["Count"]>0].reset_index(drop=True)
+    return ethnicity_counts[selected_condition]
+
 app = dash.Dash(__name__,external_stylesheets=[dbc.themes.BOOTSTRAP])
 
 app.layout = dbc.Container([
@@ -140,16 +293,13 @@ dbc.Row([
 )
 
 def update_distribution(selected_gender):
-    if selected_gender:
-        filtered_df1=ccard[ccard["Gender"]==selected_gender]
-    else:
-        filtered_df1 =ccard
+    rows=matching_rows({"Gender":selected_gender})
 
-    if filtered_df1.empty:
+    if len(rows)==0:
         return {}
     
-    fig1 = px.scatter(
-        filtered_df1,
+    fig1 = scatter_figure(
+        columns_at(rows,"Credit Limit(individual credit card account)","Current Balance in credit card account","Gender"),
         x="Credit Limit(individual credit card account)",
         y="Current Balance in credit card account",
         color="Gender",
@@ -163,16 +313,13 @@ def update_distribution(selected_gender):
     Input('ethnicity-filter','value')
 )
 def update_financialbehaviorethnicity(selected_ethnicity):
-    if selected_ethnicity:
-        filtered_df2=ccard[ccard["Ethnicity"]==selected_ethnicity]
-    else:
-        filtered_df2=ccard
+    rows=matching_rows({"Ethnicity":selected_ethnicity})
 
-    if filtered_df2.empty:
+    if len(rows)==0:
         return {}
 
     fig2 = px.bar(
-                filtered_df2,
+                columns_at(rows,"Number of Cards owned per person","Credit Rating","Ethnicity"),
                 x="Number of Cards owned per person",
                 y="Credit Rating",
                 color="Ethnicity",
@@ -187,17 +334,13 @@ def update_financialbehaviorethnicity(selected_ethnicity):
 )
 
 def update_financialbehaviornumberofcards(selected_gender):
-    filtered_df3=ccard[ccard["Gender"]==selected_gender] 
-    if selected_gender:
-        filtered_df3=ccard[ccard["Gender"]==selected_gender]
-    else:
-        filtered_df3 =ccard
+    rows=matching_rows({"Gender":selected_gender})
 
-    if filtered_df3.empty:
+    if len(rows)==0:
         return {}
     
-    fig3=px.scatter(
-        filtered_df3,
+    fig3=scatter_figure(
+        columns_at(rows,"Credit Limit(individual credit card account)","Current Balance in credit card account","Student"),
         x="Credit Limit(individual credit card account)",
         y="Current Balance in credit card account",
         color="Student",
@@ -212,23 +355,24 @@ def update_financialbehaviornumberofcards(selected_gender):
      Input('Education-slider','value')]
 )
 def update_financialbehavioreducation(selected_gender,slider_value):
-    filtered_df=ccard[ccard["Gender"]==selected_gender]
-    if selected_gender:
-        filtered_df=ccard[ccard["Gender"]==selected_gender]
-    else:
-        filtered_df =ccard
+    partition=education_index.get(selected_gender or None)
 
-    if filtered_df.empty:
+    if partition is None or len(partition["rows"])==0:
         return {}
 
+    title="Financial Behavior Gender and Years of Education"
+    end=np.searchsorted(partition["years"],slider_value,side="right")
+    if end>BINNED_ROWS:
+        level=np.searchsorted(partition["levels"],slider_value,side="right")-1
+        binned=binned_points(partition["cumulative"][level],partition["grid"],credit_limit,current_balance)
+        return binned_figure(binned,x=credit_limit,y=current_balance,title=title)
 
+    rows=partition["rows"][:end]
 
-    filtered_df=filtered_df[filtered_df['Number of years of Education']<= slider_value]
-
-    fig4= px.scatter(filtered_df,
-            x="Credit Limit(individual credit card account)",
-            y="Current Balance in credit card account",
-            title="Financial Behavior Gender and Years of Education")
+    fig4= scatter_figure(columns_at(rows,credit_limit,current_balance),
+            x=credit_limit,
+            y=current_balance,
+            title=title)
     return fig4
 
 @app.callback(
@@ -238,8 +382,7 @@ def update_financialbehavioreducation(selected_gender,slider_value):
 )
 
 def update_financialstatus(chart_type,selected_condition):
-    filtered_df=ccard[ccard["Married"]==selected_condition]if selected_condition else ccard
-    finance_df = filtered_df.groupby("Ethnicity").size().reset_index(name="Count")
+    finance_df = counts_by_ethnicity(selected_condition)
 
     if chart_type == "line":
         fig = px.line(finance_df,